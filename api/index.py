@@ -1,19 +1,154 @@
-from flask import Flask, render_template_string, request, redirect, url_for, flash, session
+from flask import Flask, render_template, request, g, redirect, url_for, flash, session, jsonify, Response, stream_with_context, abort, send_from_directory, has_request_context
+from jinja2 import DictLoader
+from werkzeug.exceptions import HTTPException
+import atexit
+import bisect
+import contextvars
+import cProfile
+import io
+import pstats
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import hashlib
 import json
 import os
+import queue
+import sqlite3
 from datetime import datetime, timedelta
-from pymongo import MongoClient
+from bson import ObjectId
+from pymongo import MongoClient, ReturnDocument, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure, PyMongoError
 import logging
+import threading
+import time
+import urllib.request
 logging.basicConfig(level=logging.INFO)
 
-app = Flask(__name__)
+# root_path is explicit because serverless runtimes may import this file under another name
+app = Flask(__name__, root_path=os.path.dirname(os.path.abspath(__file__)))
 app.secret_key = os.environ.get('SECRET_KEY', 'change_this')
 
-# MongoDB setup
+# Startup-phase timings (milliseconds), so cold starts can be broken down.
+_process_started = time.perf_counter()
+startup_timings = {}
+_first_request = {'path': None}
+
+def record_startup(phase, started):
+    startup_timings.setdefault(phase, round((time.perf_counter() - started) * 1000, 2))
+
+# Prometheus metrics, kept in plain dicts and rendered in the text exposition
+# format by /metrics. Labels are tuples of (name, value) pairs.
+METRIC_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS = {
+    'timers_request_duration_seconds': ('histogram', 'Request duration by route.'),
+    'timers_request_phase_seconds': ('histogram', 'Time spent in each phase of a request.'),
+    'timers_response_bytes_total': ('counter', 'Response body bytes sent by route.'),
+    'timers_responses_total': ('counter', 'Responses sent by route and status.'),
+    'timers_store_fetch_seconds': ('histogram', 'Full timer loads from the store.'),
+    'timers_mongo_command_seconds': ('histogram', 'MongoDB command round trips by command and outcome.'),
+    'timers_resets_deduplicated_total': ('counter', 'Resets answered with the existing timer instead of a write.'),
+    'timers_feed_entries_rendered_total': ('counter', 'Per-boss schedule feed entries rendered, by feed.'),
+}
+_histograms = {}
+_counters = {}
+_metrics_lock = threading.Lock()
+
+def observe(metric, labels, value):
+    with _metrics_lock:
+        series = _histograms.get((metric, labels))
+        if series is None:
+            series = _histograms[(metric, labels)] = {'buckets': [0] * len(METRIC_BUCKETS), 'sum': 0.0, 'count': 0}
+        i = bisect.bisect_left(METRIC_BUCKETS, value)
+        if i < len(METRIC_BUCKETS):
+            series['buckets'][i] += 1
+        series['sum'] += value
+        series['count'] += 1
+
+def inc(metric, labels, amount=1):
+    with _metrics_lock:
+        _counters[(metric, labels)] = _counters.get((metric, labels), 0) + amount
+
+def _format_labels(labels, extra=()):
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join('%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in pairs) + '}'
+
+def render_metrics():
+    lines = []
+    with _metrics_lock:
+        histograms = {key: {'buckets': list(v['buckets']), 'sum': v['sum'], 'count': v['count']} for key, v in _histograms.items()}
+        counters = dict(_counters)
+    for metric, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} {kind}')
+        if kind == 'histogram':
+            for (name, labels), series in sorted(histograms.items()):
+                if name != metric:
+                    continue
+                cumulative = 0
+                for bound, count in zip(METRIC_BUCKETS, series['buckets']):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{_format_labels(labels, (("le", bound),))} {cumulative}')
+                lines.append(f'{metric}_bucket{_format_labels(labels, (("le", "+Inf"),))} {series["count"]}')
+                lines.append(f'{metric}_sum{_format_labels(labels)} {series["sum"]}')
+                lines.append(f'{metric}_count{_format_labels(labels)} {series["count"]}')
+        else:
+            for (name, labels), value in sorted(counters.items()):
+                if name == metric:
+                    lines.append(f'{metric}{_format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+@contextmanager
+def timed_phase(phase):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        route = request.endpoint or 'unmatched'
+        observe('timers_request_phase_seconds', (('route', route), ('phase', phase)), time.perf_counter() - started)
+
+class _MongoCommandMetrics(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        observe('timers_mongo_command_seconds', (('command', event.command_name), ('outcome', 'ok')), event.duration_micros / 1e6)
+
+    def failed(self, event):
+        observe('timers_mongo_command_seconds', (('command', event.command_name), ('outcome', 'error')), event.duration_micros / 1e6)
+
+# MongoDB setup. The client is built on first use rather than at import, so
+# routes that never touch the database (like /login) skip SRV resolution
+# and pool setup on a cold start. One client is shared by every request.
 MONGO_URI = os.environ.get('MONGO_URI', 'mongodb://localhost:27017')
-client = MongoClient(MONGO_URI)
-db = client['axiom']
-timers_collection = db['timers']
+MONGO_DB = os.environ.get('MONGO_DB', 'axiom')
+MONGO_OPTIONS = {
+    'maxPoolSize': int(os.environ.get('MONGO_MAX_POOL_SIZE', '10')),
+    'minPoolSize': int(os.environ.get('MONGO_MIN_POOL_SIZE', '0')),
+    'maxIdleTimeMS': int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '60000')),
+    'connectTimeoutMS': int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000')),
+    'socketTimeoutMS': int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '10000')),
+    'serverSelectionTimeoutMS': int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000')),
+}
+_mongo = {'client': None, 'db': None}
+_mongo_lock = threading.Lock()
+
+def get_db():
+    if _mongo['db'] is None:
+        with _mongo_lock:
+            if _mongo['db'] is None:
+                started = time.perf_counter()
+                client = MongoClient(MONGO_URI, event_listeners=[_MongoCommandMetrics()], **MONGO_OPTIONS)
+                record_startup('mongo_client', started)
+                _mongo['client'] = client
+                _mongo['db'] = client[MONGO_DB]
+    return _mongo['db']
+
+def get_timers_collection():
+    return get_db()['timers']
 
 # Hardcoded boss data (edit as needed)
 BOSSES = [
@@ -76,22 +211,1918 @@ USERS = {
     'user4': 'user4',
 }
 
+# Users allowed to profile requests and read the dumps (edit as needed)
+ADMINS = {'dontcallmeblack'}
+
+# Tenants. Each clan is a tenant with its own users, boss catalog, timers and
+# kill history, and its own snapshot, schedule and payload caches, so a busy
+# clan never evicts another's. TENANTS_FILE names a JSON object of
+# {"<tenant>": {"users": {...}, "admins": [...], "api_tokens": [...], "catalog": ...}}
+# where catalog is a list shaped like BOSSES, a JSON file path or 'mongo'.
+# Without it there is one DEFAULT_TENANT using USERS, ADMINS, API_TOKENS and
+# BOSS_CATALOG. On MongoDB, run `index.py migrate` once per deploy of a new
+# database and before adding a second tenant: it re-keys timers on
+# (tenant, name) and creates the timer and kill indexes.
+DEFAULT_TENANT = os.environ.get('DEFAULT_TENANT', 'axiom')
+TENANTS_FILE = os.environ.get('TENANTS_FILE', '')
+
+def _load_tenant_configs():
+    if not TENANTS_FILE:
+        return {DEFAULT_TENANT: {}}
+    with open(TENANTS_FILE) as f:
+        return json.load(f)
+
+_tenant_configs = _load_tenant_configs()
+_current_tenant = contextvars.ContextVar('tenant', default=None)
+
+def tenant_setting(tenant, key, default=None):
+    # the default tenant falls back to the module-level setting, others to nothing
+    config = _tenant_configs.get(tenant) or {}
+    if key in config:
+        return config[key]
+    return default if tenant == DEFAULT_TENANT else None
+
+def current_tenant():
+    tenant = _current_tenant.get()
+    if tenant is None and has_request_context():
+        tenant = g.get('tenant')
+    return tenant or DEFAULT_TENANT
+
+@contextmanager
+def tenant_scope(tenant):
+    # background threads have no request, so they name the tenant they work for
+    token = _current_tenant.set(tenant)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+def tenant_users(tenant):
+    return tenant_setting(tenant, 'users', USERS) or {}
+
+def tenant_admins(tenant):
+    return set(tenant_setting(tenant, 'admins', ADMINS) or ())
+
+def _token_tenant(token):
+    for tenant in _tenant_configs:
+        if token in (tenant_setting(tenant, 'api_tokens', API_TOKENS) or ()):
+            return tenant
+    return None
+
+# Timer storage. The snapshot cache sits in front of a TimerStore; MongoDB is
+# the default, with in-memory and SQLite stores for single-node deployments,
+# local load tests and benchmarks. Pick one with TIMER_STORE.
+TIMER_STORE = os.environ.get('TIMER_STORE', 'mongo')
+SQLITE_PATH = os.environ.get('SQLITE_PATH', 'timers.db')
+
+class TimerStore(ABC):
+    # A store instance belongs to one tenant and only reads and writes its documents.
+    # Documents are dicts with 'name', 'user' and naive-UTC datetimes for TIME_FIELDS.
+    # Every write also bumps the document's 'rev', so the sum of revs over all
+    # timers is a version of the whole set that every instance agrees on.
+    # Stores that other processes can write to are 'shared'; the snapshot of an
+    # unshared store never goes stale because every write passes through it.
+    shared = True
+
+    @abstractmethod
+    def load_all(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset(self, boss, username, reset_id=None, dedupe_seconds=0):
+        # Stamp a kill at the current time and return (doc, created). A timer already
+        # stamped with reset_id, or killed less than dedupe_seconds ago, is returned
+        # unchanged with created False.
+        raise NotImplementedError
+
+    @abstractmethod
+    def shift(self, boss_name, minutes):
+        # move every stored instant back; returns the new document, or None without a timer
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_many(self, docs):
+        # Upsert whole documents in one round trip; returns {index: error} for the ones
+        # that weren't written. A timer already holding a kill at or after the document's
+        # is left alone and reported as STALE_WRITE, so an older kill never moves it back.
+        raise NotImplementedError
+
+    def watch(self):
+        # context manager yielding change events for every tenant, or None if the store has no change feed
+        return None
+
+    @abstractmethod
+    def append_kills(self, kills):
+        # Append-only history; records carry name, kill_time, user, action, recorded_at
+        # and a stable '_id'. Returns {index: error} for the records that weren't stored;
+        # a record whose _id is already there counts as stored, so retries are safe.
+        raise NotImplementedError
+
+    @abstractmethod
+    def query_kills(self, name=None, user=None, since=None, before=None, before_id=None, limit=50):
+        # Newest first, ordered by (kill_time, id), with kill_time at or after `since`.
+        # Records carry a string 'id'; pass the last record's kill_time and id as
+        # before/before_id for the next page. A bad before_id raises ValueError.
+        raise NotImplementedError
+
+STALE_WRITE = 'a newer kill is already recorded'
+
+def _tenant_match(tenant):
+    # documents written before tenants existed belong to the default tenant
+    if tenant == DEFAULT_TENANT:
+        return {'tenant': {'$in': [tenant, None]}}
+    return {'tenant': tenant}
+
+class MongoTimerStore(TimerStore):
+    def __init__(self, tenant=DEFAULT_TENANT):
+        self.tenant = tenant
+        self.match = _tenant_match(tenant)
+
+    # indexes are created by `index.py migrate`, never on the request path
+    def _timers(self):
+        return get_timers_collection()
+
+    def _key(self, boss_name):
+        return dict(self.match, name=boss_name)
+
+    def _fields(self, timer_data):
+        return dict(_without_rev(timer_data), tenant=self.tenant)
+
+    def load_all(self):
+        timers = {}
+        for doc in self._timers().find(self.match):
+            timers[doc['name']] = _normalize_timer(doc)
+        return timers
+
+    def reset(self, boss, username, reset_id=None, dedupe_seconds=0):
+        # The duplicate check and the write are one atomic round trip. The kill time
+        # is passed in rather than taken from $$NOW so the document from before the
+        # update is enough to tell whether this call wrote it.
+        now = utcnow()
+        doc = _reset_doc(boss, username, now, reset_id)
+        fields = {key: {'$literal': value} for key, value in self._fields(doc).items()}
+        fields['rev'] = {'$add': [{'$ifNull': ['$rev', 0]}, 1]}
+        duplicate = [{'$gt': ['$kill_time', now - timedelta(seconds=dedupe_seconds)]}]
+        if reset_id:
+            duplicate.append({'$eq': ['$reset_id', {'$literal': reset_id}]})
+        fields = {key: {'$cond': [{'$or': duplicate}, '$' + key, value]} for key, value in fields.items()}
+        before = self._timers().find_one_and_update(
+            self._key(boss['name']),
+            [{'$set': fields}],
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is not None:
+            before = _normalize_timer(before)
+        if _reset_is_duplicate(before, now, reset_id, dedupe_seconds):
+            return before, False
+        doc['rev'] = (before or {}).get('rev', 0) + 1
+        return doc, True
+
+    def shift(self, boss_name, minutes):
+        delta_ms = minutes * 60000
+        # $subtract only works on BSON dates, so the one-round-trip update is
+        # limited to migrated documents
+        dates = {key: {'$not': {'$type': 'string'}} for key in TIME_FIELDS}
+        dates['kill_time'] = {'$type': 'date'}
+        doc = self._timers().find_one_and_update(
+            dict(self._key(boss_name), **dates),
+            [{'$set': {
+                **{
+                    key: {'$cond': [{'$ifNull': ['$' + key, False]}, {'$subtract': ['$' + key, delta_ms]}, '$$REMOVE']}
+                    for key in TIME_FIELDS
+                },
+                'rev': {'$add': [{'$ifNull': ['$rev', 0]}, 1]},
+            }}],
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is not None:
+            return doc
+        # a timer still holding ISO strings: parse, shift and write back BSON dates,
+        # guarded on its rev so a concurrent write is never overwritten
+        for _ in range(3):
+            current = self._timers().find_one(dict(self._key(boss_name), kill_time={'$ne': None}))
+            if current is None:
+                return None
+            current = _normalize_timer(current)
+            update = {key: current[key] - timedelta(minutes=minutes) for key in TIME_FIELDS if current.get(key)}
+            doc = self._timers().find_one_and_update(
+                {'_id': current['_id'], 'rev': current.get('rev')},
+                {'$set': update, '$inc': {'rev': 1}},
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is not None:
+                return doc
+        raise OperationFailure(f'{boss_name} kept changing while it was being shifted')
+
+    def save_many(self, docs):
+        requests = []
+        for doc in docs:
+            # the comparison runs inside the update, so a racing reset can't be overwritten
+            newer = {'$lt': ['$kill_time', doc['kill_time']]}
+            fields = {key: {'$cond': [newer, {'$literal': value}, '$' + key]} for key, value in self._fields(doc).items()}
+            fields['rev'] = {'$cond': [newer, {'$add': [{'$ifNull': ['$rev', 0]}, 1]}, '$rev']}
+            requests.append(UpdateOne(self._key(doc['name']), [{'$set': fields}], upsert=True))
+        errors = {}
+        try:
+            self._timers().bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            errors = {err['index']: err['errmsg'] for err in e.details.get('writeErrors', [])}
+        # the bulk result doesn't say which updates the guard skipped, so compare what is stored
+        stored = {
+            doc['name']: doc
+            for doc in self._timers().find(dict(self.match, name={'$in': [doc['name'] for doc in docs]}), {'kill_time': 1, 'reset_id': 1, 'name': 1})
+        }
+        for i, doc in enumerate(docs):
+            current = stored.get(doc['name']) or {}
+            if i not in errors and (current.get('kill_time') != doc['kill_time'] or current.get('reset_id') != doc.get('reset_id')):
+                errors[i] = STALE_WRITE
+        return errors
+
+    def watch(self):
+        # one stream for the whole collection; events are routed by their tenant field
+        return get_timers_collection().watch(full_document='updateLookup')
+
+    def _kills(self):
+        return get_db()['kills']
+
+    def append_kills(self, kills):
+        try:
+            self._kills().insert_many([dict(kill, tenant=self.tenant) for kill in kills], ordered=False)
+        except BulkWriteError as e:
+            # a duplicate _id is a record an earlier, seemingly failed attempt already stored
+            return {err['index']: err['errmsg'] for err in e.details.get('writeErrors', []) if err.get('code') != 11000}
+        return {}
+
+    def query_kills(self, name=None, user=None, since=None, before=None, before_id=None, limit=50):
+        query = dict(self.match)
+        if name:
+            query['name'] = name
+        if user:
+            query['user'] = user
+        if since:
+            query['kill_time'] = {'$gte': since}
+        if before and before_id:
+            if not ObjectId.is_valid(before_id):
+                raise ValueError(f'invalid kill id {before_id!r}')
+            query['$or'] = [{'kill_time': {'$lt': before}}, {'kill_time': before, '_id': {'$lt': ObjectId(before_id)}}]
+        elif before:
+            query.setdefault('kill_time', {})['$lt'] = before
+        kills = self._kills().find(query, {'tenant': 0}).sort([('kill_time', -1), ('_id', -1)]).limit(limit)
+        return [dict(kill, id=str(kill.pop('_id'))) for kill in kills]
+
+def _reset_doc(boss, username, kill_dt, reset_id=None):
+    spawn_dt = kill_dt + boss['respawn']
+    return {
+        'name': boss['name'],
+        'kill_time': kill_dt,
+        'spawn_time': spawn_dt,
+        'window_end_time': spawn_dt + boss['window'],
+        'user': username,
+        'reset_id': reset_id,
+    }
+
+def _without_rev(doc):
+    # rev is only ever incremented by the store
+    return {key: value for key, value in doc.items() if key != 'rev'}
+
+def _reset_is_duplicate(doc, now, reset_id, dedupe_seconds):
+    if not doc:
+        return False
+    if reset_id and doc.get('reset_id') == reset_id:
+        return True
+    return bool(doc.get('kill_time')) and now - doc['kill_time'] < timedelta(seconds=dedupe_seconds)
+
+class MemoryTimerStore(TimerStore):
+    shared = False
+
+    def __init__(self):
+        self._timers = {}
+        self._kills = []
+        self._kill_ids = set()
+        self._lock = threading.Lock()
+
+    def load_all(self):
+        with self._lock:
+            return {name: dict(doc) for name, doc in self._timers.items()}
+
+    def _write(self, boss_name, timer_data):
+        doc = self._timers.setdefault(boss_name, {'name': boss_name})
+        doc.update(_without_rev(timer_data))
+        doc['rev'] = doc.get('rev', 0) + 1
+        return doc
+
+    def reset(self, boss, username, reset_id=None, dedupe_seconds=0):
+        now = utcnow()
+        with self._lock:
+            doc = self._timers.get(boss['name'])
+            if _reset_is_duplicate(doc, now, reset_id, dedupe_seconds):
+                return dict(doc), False
+            rev = doc.get('rev', 0) if doc else 0
+            doc = self._timers[boss['name']] = _reset_doc(boss, username, now, reset_id)
+            doc['rev'] = rev + 1
+            return dict(doc), True
+
+    def shift(self, boss_name, minutes):
+        delta = timedelta(minutes=minutes)
+        with self._lock:
+            doc = self._timers.get(boss_name)
+            if not doc or not doc.get('kill_time'):
+                return None
+            for key in TIME_FIELDS:
+                if doc.get(key):
+                    doc[key] -= delta
+            doc['rev'] = doc.get('rev', 0) + 1
+            return dict(doc)
+
+    def save_many(self, docs):
+        errors = {}
+        with self._lock:
+            for i, doc in enumerate(docs):
+                current = self._timers.get(doc['name'])
+                if current and current.get('kill_time') and current['kill_time'] >= doc['kill_time']:
+                    errors[i] = STALE_WRITE
+                else:
+                    self._write(doc['name'], doc)
+        return errors
+
+    def append_kills(self, kills):
+        with self._lock:
+            fresh = [kill for kill in kills if kill.get('_id') is None or kill['_id'] not in self._kill_ids]
+            self._kill_ids.update(kill.get('_id') for kill in fresh)
+            start = len(self._kills)
+            self._kills.extend(
+                dict({key: value for key, value in kill.items() if key != '_id'}, id=str(start + i))
+                for i, kill in enumerate(fresh)
+            )
+        return {}
+
+    def query_kills(self, name=None, user=None, since=None, before=None, before_id=None, limit=50):
+        cursor = (before, int(before_id)) if before and before_id else None
+
+        def older(kill):
+            if cursor:
+                return (kill['kill_time'], int(kill['id'])) < cursor
+            return not before or kill['kill_time'] < before
+
+        with self._lock:
+            matches = [
+                dict(kill) for kill in self._kills
+                if (not name or kill['name'] == name) and (not user or kill['user'] == user)
+                and (not since or kill['kill_time'] >= since) and older(kill)
+            ]
+        matches.sort(key=lambda kill: (kill['kill_time'], int(kill['id'])), reverse=True)
+        return matches[:limit]
+
+_EPOCH = datetime(1970, 1, 1)
+
+def _to_epoch_ms(dt):
+    return None if dt is None else (dt - _EPOCH) // timedelta(milliseconds=1)
+
+def _from_epoch_ms(ms):
+    return None if ms is None else _EPOCH + timedelta(milliseconds=ms)
+
+_SQLITE_TIMERS_TABLE = (
+    'CREATE TABLE IF NOT EXISTS timers ('
+    'tenant TEXT NOT NULL, name TEXT NOT NULL, kill_time INTEGER, spawn_time INTEGER, window_end_time INTEGER, '
+    'user TEXT, reset_id TEXT, rev INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (tenant, name))'
+)
+
+class SQLiteTimerStore(TimerStore):
+    # Instants are stored as integer epoch milliseconds. WAL mode lets readers
+    # run alongside the single writer; each thread keeps its own connection.
+    # Every tenant's store shares the file; rows are keyed on (tenant, name).
+    def __init__(self, path, tenant=DEFAULT_TENANT):
+        self.path = path
+        self.tenant = tenant
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(_SQLITE_TIMERS_TABLE)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS kills ('
+            'name TEXT NOT NULL, kill_time INTEGER NOT NULL, user TEXT, action TEXT, recorded_at INTEGER)'
+        )
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(timers)')}
+        if 'reset_id' not in columns:
+            conn.execute('ALTER TABLE timers ADD COLUMN reset_id TEXT')
+        if 'rev' not in columns:
+            conn.execute('ALTER TABLE timers ADD COLUMN rev INTEGER NOT NULL DEFAULT 0')
+        if 'tenant' not in columns:
+            self._add_tenant_key(conn)
+        if 'tenant' not in {row['name'] for row in conn.execute('PRAGMA table_info(kills)')}:
+            conn.execute('ALTER TABLE kills ADD COLUMN tenant TEXT')
+            conn.execute('UPDATE kills SET tenant = ?', (DEFAULT_TENANT,))
+        conn.execute('DROP INDEX IF EXISTS kills_name_time')
+        conn.execute('DROP INDEX IF EXISTS kills_user_time')
+        conn.execute('CREATE INDEX IF NOT EXISTS kills_tenant_name_time ON kills (tenant, name, kill_time)')
+        conn.execute('CREATE INDEX IF NOT EXISTS kills_tenant_user_time ON kills (tenant, user, kill_time)')
+
+    def _add_tenant_key(self, conn):
+        # timers used to be keyed on name alone; its rows move to the default tenant
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # another tenant's store may have rebuilt it while we waited
+            if 'tenant' not in {row['name'] for row in conn.execute('PRAGMA table_info(timers)')}:
+                conn.execute('ALTER TABLE timers RENAME TO timers_by_name')
+                conn.execute(_SQLITE_TIMERS_TABLE)
+                conn.execute(
+                    'INSERT INTO timers (tenant, name, kill_time, spawn_time, window_end_time, user, reset_id, rev) '
+                    'SELECT ?, name, kill_time, spawn_time, window_end_time, user, reset_id, rev FROM timers_by_name',
+                    (DEFAULT_TENANT,),
+                )
+                conn.execute('DROP TABLE timers_by_name')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _doc(self, row):
+        doc = {'name': row['name'], 'user': row['user'], 'reset_id': row['reset_id'], 'rev': row['rev']}
+        for key in TIME_FIELDS:
+            if row[key] is not None:
+                doc[key] = _from_epoch_ms(row[key])
+        return doc
+
+    def _get(self, conn, boss_name):
+        row = conn.execute('SELECT * FROM timers WHERE tenant = ? AND name = ?', (self.tenant, boss_name)).fetchone()
+        return self._doc(row) if row else None
+
+    def _upsert(self, conn, boss_name, timer_data, newer_only=False):
+        # returns whether a row was written; newer_only keeps a timer with a later kill
+        columns = ['tenant', 'name'] + [key for key in TIME_FIELDS + ('user', 'reset_id') if key in timer_data]
+        values = [self.tenant, boss_name] + [_to_epoch_ms(timer_data[key]) if key in TIME_FIELDS else timer_data[key] for key in columns[2:]]
+        updates = ''.join(f'{key} = excluded.{key}, ' for key in columns[2:])
+        guard = ' WHERE timers.kill_time IS NULL OR excluded.kill_time > timers.kill_time' if newer_only else ''
+        cursor = conn.execute(
+            f'INSERT INTO timers ({", ".join(columns)}, rev) VALUES ({", ".join("?" * len(columns))}, 1) '
+            f'ON CONFLICT(tenant, name) DO UPDATE SET {updates}rev = rev + 1{guard}',
+            values,
+        )
+        return cursor.rowcount > 0
+
+    def load_all(self):
+        rows = self._connect().execute('SELECT * FROM timers WHERE tenant = ?', (self.tenant,))
+        return {row['name']: self._doc(row) for row in rows}
+
+    def reset(self, boss, username, reset_id=None, dedupe_seconds=0):
+        conn = self._connect()
+        now = utcnow()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            doc = self._get(conn, boss['name'])
+            created = not _reset_is_duplicate(doc, now, reset_id, dedupe_seconds)
+            if created:
+                self._upsert(conn, boss['name'], _reset_doc(boss, username, now, reset_id))
+                doc = self._get(conn, boss['name'])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return doc, created
+
+    def shift(self, boss_name, minutes):
+        conn = self._connect()
+        delta_ms = minutes * 60000
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'UPDATE timers SET kill_time = kill_time - :d, spawn_time = spawn_time - :d, '
+                'window_end_time = window_end_time - :d, rev = rev + 1 '
+                'WHERE tenant = :tenant AND name = :name AND kill_time IS NOT NULL',
+                {'d': delta_ms, 'tenant': self.tenant, 'name': boss_name},
+            )
+            doc = self._get(conn, boss_name)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return doc if doc and doc.get('kill_time') else None
+
+    def save_many(self, docs):
+        conn = self._connect()
+        errors = {}
+        conn.execute('BEGIN')
+        try:
+            for i, doc in enumerate(docs):
+                if not self._upsert(conn, doc['name'], doc, newer_only=True):
+                    errors[i] = STALE_WRITE
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return errors
+
+    def append_kills(self, kills):
+        conn = self._connect()
+        conn.execute('BEGIN')
+        try:
+            conn.executemany(
+                'INSERT INTO kills (tenant, name, kill_time, user, action, recorded_at) VALUES (?, ?, ?, ?, ?, ?)',
+                [(self.tenant, k['name'], _to_epoch_ms(k['kill_time']), k['user'], k['action'], _to_epoch_ms(k['recorded_at'])) for k in kills],
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return {}
+
+    def query_kills(self, name=None, user=None, since=None, before=None, before_id=None, limit=50):
+        clauses, params = ['tenant = ?'], [self.tenant]
+        for column, value in (('name', name), ('user', user)):
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if since:
+            clauses.append('kill_time >= ?')
+            params.append(_to_epoch_ms(since))
+        if before and before_id:
+            clauses.append('(kill_time, rowid) < (?, ?)')
+            params.extend([_to_epoch_ms(before), int(before_id)])
+        elif before:
+            clauses.append('kill_time < ?')
+            params.append(_to_epoch_ms(before))
+        rows = self._connect().execute(
+            f'SELECT rowid, * FROM kills WHERE {" AND ".join(clauses)} ORDER BY kill_time DESC, rowid DESC LIMIT ?',
+            params + [limit],
+        )
+        return [
+            {'id': str(row['rowid']), 'name': row['name'], 'kill_time': _from_epoch_ms(row['kill_time']), 'user': row['user'],
+             'action': row['action'], 'recorded_at': _from_epoch_ms(row['recorded_at'])}
+            for row in rows
+        ]
+
+# tenant -> TimerStore
+_stores = {}
+_store_lock = threading.Lock()
+
+def _make_store(tenant):
+    if TIMER_STORE == 'memory':
+        return MemoryTimerStore()
+    if TIMER_STORE == 'sqlite':
+        return SQLiteTimerStore(SQLITE_PATH, tenant)
+    return MongoTimerStore(tenant)
+
+def get_store(tenant=None):
+    tenant = tenant or current_tenant()
+    store = _stores.get(tenant)
+    if store is None:
+        with _store_lock:
+            store = _stores.get(tenant)
+            if store is None:
+                store = _stores[tenant] = _make_store(tenant)
+    return store
+
+def set_store(store):
+    # swap the current tenant's backend at runtime (benchmarks, tests); drops its cached snapshot
+    with _store_lock:
+        _stores[current_tenant()] = store
+    invalidate_timers()
+
+# Timer snapshot cache, one per tenant. Reads are served from memory; every write
+# patches the snapshot in place and a change stream keeps it in sync with other
+# instances. Without change streams (standalone mongod) the snapshot expires after a TTL.
+# A process that was frozen or lost events without noticing would trust a watched
+# snapshot forever, so it is still reloaded after TIMER_CACHE_MAX_AGE seconds, and
+# serverless runtimes (VERCEL is set there), which freeze between requests, don't watch.
+TIMER_CACHE_TTL = float(os.environ.get('TIMER_CACHE_TTL', '5'))
+TIMER_CACHE_MAX_AGE = float(os.environ.get('TIMER_CACHE_MAX_AGE', '60'))
+TIMER_CACHE_WATCH = os.environ.get('TIMER_CACHE_WATCH', '0' if os.environ.get('VERCEL') else '1') != '0'
+
+class _TenantState:
+    # everything cached for one tenant; tenants never share or evict each other's entries
+    def __init__(self, tenant):
+        self.tenant = tenant
+        self.timer_cache = {
+            'timers': None,
+            'version': 0,
+            'loaded_at': 0.0,
+            'dirty': False,
+            # every card may differ from what a client saw before this version
+            'all_changed_at': 0,
+            # sum of the stored revs: the same on every instance for the same timers
+            'revision': 0,
+        }
+        # boss name -> snapshot version that last changed its timer
+        self.card_versions = {}
+        # reentrant: a catalog reload can bump the version while the schedule is being rebuilt
+        self.lock = threading.RLock()
+        # notified whenever the revision moves; long polls wait on it
+        self.revision_changed = threading.Condition(self.lock)
+        self.schedule = {'version': None, 'times': [], 'names': [], 'entries': {}}
+        self.catalog = {'bosses': [], 'by_name': {}, 'stamp': None, 'checked_at': None}
+        self.catalog_reload_lock = threading.Lock()
+        self.api_timers_cache = {'version': None, 'body': None, 'etag': None}
+        self.feeds = {kind: {'version': None, 'body': None, 'etag': None, 'chunks': {}} for kind in FEED_TYPES}
+        self.feeds_lock = threading.Lock()
+        self.spawn_stats = {'seeded': False, 'seeding': False, 'bosses': {}}
+        self.spawn_stats_lock = threading.RLock()
+        self.degraded = {'since': None, 'as_of': None, 'pending': []}
+        self.disk_snapshot = {'body': None, 'confirmed_at': None}
+
+_tenant_states = {}
+_tenant_states_lock = threading.Lock()
+
+def tenant_state(tenant=None):
+    tenant = tenant or current_tenant()
+    state = _tenant_states.get(tenant)
+    if state is None:
+        with _tenant_states_lock:
+            state = _tenant_states.get(tenant)
+            if state is None:
+                state = _tenant_states[tenant] = _TenantState(tenant)
+    return state
+
+# one change stream serves every tenant
+_watch = {'started': False, 'active': False}
+
+TIME_FIELDS = ('kill_time', 'spawn_time', 'window_end_time')
+
+def _bson_time(dt):
+    # BSON dates only keep milliseconds; truncate so cached copies match the stored ones
+    return dt.replace(microsecond=dt.microsecond // 1000 * 1000)
+
+def utcnow():
+    return _bson_time(datetime.utcnow())
+
+def _normalize_timer(doc):
+    # documents written before the datetime migration still hold ISO strings
+    for key in TIME_FIELDS:
+        if isinstance(doc.get(key), str):
+            doc[key] = datetime.fromisoformat(doc[key])
+    return doc
+
+def _fetch_timers():
+    started = time.perf_counter()
+    timers = get_store().load_all()
+    record_startup('first_timer_fetch', started)
+    observe('timers_store_fetch_seconds', (('store', TIMER_STORE),), time.perf_counter() - started)
+    return timers
+
+def _cache_fresh(ts):
+    cache = ts.timer_cache
+    if cache['timers'] is None or cache['dirty']:
+        return False
+    if not get_store().shared:
+        return True
+    age = time.monotonic() - cache['loaded_at']
+    return age < (TIMER_CACHE_MAX_AGE if _watch['active'] else TIMER_CACHE_TTL)
+
+def _store_snapshot(timers, seen_version):
+    ts = tenant_state()
+    cache = ts.timer_cache
+    changed = []
+    with ts.lock:
+        # a write landed while we were fetching, so this result may predate it
+        cache['dirty'] = cache['version'] != seen_version
+        previous = cache['timers']
+        cache['timers'] = timers
+        cache['version'] += 1
+        cache['loaded_at'] = time.monotonic()
+        if previous is None:
+            cache['all_changed_at'] = cache['version']
+        else:
+            for boss_name in previous.keys() | timers.keys():
+                if previous.get(boss_name) != timers.get(boss_name):
+                    ts.card_versions[boss_name] = cache['version']
+                    changed.append(boss_name)
+        _set_revision(ts, sum(doc.get('rev', 0) for doc in timers.values() if doc))
+    # without a change stream a reload is the only place writes from other
+    # instances show up, so open event streams and the spawn stats hear about them here
+    for boss_name in changed:
+        publish_timer(boss_name, timers.get(boss_name))
+        observe_kill(boss_name, timers.get(boss_name))
+    for boss_name, doc in timers.items():
+        schedule_alerts(boss_name, doc)
+
+def _set_revision(ts, revision):
+    # caller holds ts.lock
+    if revision != ts.timer_cache['revision']:
+        ts.timer_cache['revision'] = revision
+        ts.revision_changed.notify_all()
+
+def _patch_snapshot(boss_name, doc):
+    ts = tenant_state()
+    cache, schedule = ts.timer_cache, ts.schedule
+    _current_catalog()
+    with ts.lock:
+        timers = cache['timers']
+        previous = (timers or {}).get(boss_name)
+        if doc is not None and 'rev' not in doc:
+            # writes that don't hand back the stored document bumped its rev once
+            doc['rev'] = (previous or {}).get('rev', 0) + 1
+        if timers is not None:
+            # our own writes come back through the change stream as well
+            if previous == doc:
+                return
+            if doc is None:
+                timers.pop(boss_name, None)
+            else:
+                timers[boss_name] = doc
+            _set_revision(ts, cache['revision'] - (previous or {}).get('rev', 0) + (doc or {}).get('rev', 0))
+        if schedule['version'] == cache['version'] and timers is not None:
+            _schedule_remove(schedule, boss_name)
+            _schedule_insert(schedule, ts.catalog['by_name'].get(boss_name), doc)
+            schedule['version'] += 1
+        cache['version'] += 1
+        ts.card_versions[boss_name] = cache['version']
+    publish_timer(boss_name, doc)
+    observe_kill(boss_name, doc)
+    schedule_alerts(boss_name, doc)
+    _save_disk_snapshot()
+
+# Spawn schedule: parallel lists of spawn instants and boss names kept sorted
+# by spawn time. Writes move a single entry; full snapshot reloads rebuild it.
+# Everything here runs under the tenant's lock, so callers refresh the catalog
+# (which can mean a store query) before taking it and pass bosses from ts.catalog.
+def _schedule_remove(schedule, boss_name):
+    entry = schedule['entries'].pop(boss_name, None)
+    if entry is None:
+        return
+    times, names = schedule['times'], schedule['names']
+    i = bisect.bisect_left(times, entry[0])
+    while names[i] != boss_name:
+        i += 1
+    del times[i]
+    del names[i]
+
+def _schedule_insert(schedule, boss, doc):
+    if not boss or not doc:
+        return
+    _, spawn_dt, window_end_dt = timer_instants(boss, doc)
+    if spawn_dt is None:
+        return
+    i = bisect.bisect_right(schedule['times'], spawn_dt)
+    schedule['times'].insert(i, spawn_dt)
+    schedule['names'].insert(i, boss['name'])
+    schedule['entries'][boss['name']] = (spawn_dt, window_end_dt)
+
+def _schedule_rebuild(schedule, version, timers, by_name):
+    schedule.update(version=version, times=[], names=[], entries={})
+    for boss_name, doc in timers.items():
+        _schedule_insert(schedule, by_name.get(boss_name), doc)
+
+def spawn_schedule(now, within=None, limit=None, timers=None):
+    # (due, upcoming) lists of (name, spawn, window_end). Due bosses have
+    # spawned at or before `now`; upcoming ones are capped by `within` and `limit`.
+    if timers is None:
+        _, timers = timers_snapshot()
+    ts = tenant_state()
+    schedule = ts.schedule
+    _current_catalog()
+    with ts.lock:
+        if schedule['version'] != ts.timer_cache['version']:
+            _schedule_rebuild(schedule, ts.timer_cache['version'], ts.timer_cache['timers'] or timers, ts.catalog['by_name'])
+        times, names, entries = schedule['times'], schedule['names'], schedule['entries']
+        split = bisect.bisect_right(times, now)
+        end = len(times) if within is None else bisect.bisect_right(times, now + within)
+        if limit is not None:
+            end = min(end, split + limit)
+        due = [(name,) + entries[name] for name in names[:split]]
+        upcoming = [(name,) + entries[name] for name in names[split:end]]
+    return due, upcoming
+
+def invalidate_timers(tenant=None):
+    ts = tenant_state(tenant)
+    with ts.lock:
+        ts.timer_cache['timers'] = None
+        ts.timer_cache['version'] += 1
+        ts.timer_cache['all_changed_at'] = ts.timer_cache['version']
+
+def changed_cards(timers, known):
+    # names of bosses whose stored rev differs from the client's {name: rev}, or None
+    # when the client's cards aren't the current roster and every card has to be resent.
+    # Revs live on the documents, so any instance can answer for a page from any other.
+    if not isinstance(known, dict) or known.keys() != {boss['name'] for boss in get_bosses()}:
+        return None
+    return [name for name, rev in known.items() if (timers.get(name) or {}).get('rev', 0) != rev]
+
+def _apply_change(change):
+    op = change.get('operationType')
+    doc = change.get('fullDocument')
+    if op in ('insert', 'update', 'replace') and doc and 'name' in doc:
+        tenant = doc.get('tenant') or DEFAULT_TENANT
+        if tenant in _tenant_configs:
+            with tenant_scope(tenant):
+                _patch_snapshot(doc['name'], _normalize_timer(doc))
+    else:
+        # deletes only carry the _id, and drop/invalidate wipe everything
+        for tenant in list(_tenant_states):
+            invalidate_timers(tenant)
+
+def _watch_timers():
+    while True:
+        try:
+            stream = get_store(DEFAULT_TENANT).watch()
+            if stream is None:
+                return
+            with stream:
+                _watch['active'] = True
+                # anything written between the last fetch and opening the stream is lost otherwise
+                for tenant in list(_tenant_states):
+                    invalidate_timers(tenant)
+                for change in stream:
+                    _apply_change(change)
+        except OperationFailure as e:
+            logging.info('Timer change stream unavailable, falling back to %ss TTL: %s', TIMER_CACHE_TTL, e)
+            return
+        except PyMongoError as e:
+            logging.warning('Timer change stream interrupted: %s', e)
+        finally:
+            _watch['active'] = False
+        time.sleep(5)
+
+# Single-flight reads: while one request is fetching, concurrent callers wait
+# for its result instead of issuing their own query.
+_read_stats = {
+    'reads': 0,
+    'cache_hits': 0,
+    'fetches': 0,
+    'coalesced': 0,
+    'stale_reads': 0,
+}
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _count(stat, n=1):
+    with _inflight_lock:
+        _read_stats[stat] += n
+
+def _single_flight(key, fn):
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = {'event': threading.Event(), 'result': None, 'error': None}
+        else:
+            _read_stats['coalesced'] += 1
+    if not leader:
+        call['event'].wait()
+        if call['error'] is not None:
+            raise call['error']
+        return call['result']
+    try:
+        call['result'] = fn()
+    except Exception as e:
+        call['error'] = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        call['event'].set()
+    return call['result']
+
+def _refresh_timers():
+    _count('fetches')
+    seen_version = tenant_state().timer_cache['version']
+    _store_snapshot(_fetch_timers(), seen_version)
+    _store_recovered()
+
+def read_stats():
+    with _inflight_lock:
+        stats = dict(_read_stats)
+    stats['tenant'] = current_tenant()
+    stats['cache_version'] = tenant_state().timer_cache['version']
+    stats['watching'] = _watch['active']
+    stats['startup_ms'] = dict(startup_timings)
+    stats['first_request_path'] = _first_request['path']
+    return stats
+
+# Last known state on disk. Every snapshot that changes is also written to
+# SNAPSHOT_PATH, one file per tenant, via a temp file and a rename so a reader
+# never sees half of it. If a store load fails or takes longer than
+# STORE_LATENCY_BUDGET seconds, reads are served from memory or from that file
+# and flagged stale. Resets made in the meantime are queued in the same file and
+# replayed once the store answers again.
+SNAPSHOT_PATH = os.environ.get('SNAPSHOT_PATH', os.path.join(tempfile.gettempdir(), 'timers-snapshot.json'))
+STORE_LATENCY_BUDGET = float(os.environ.get('STORE_LATENCY_BUDGET', '2'))
+_disk_snapshot_lock = threading.Lock()
+
+def _snapshot_path(tenant):
+    root, ext = os.path.splitext(SNAPSHOT_PATH)
+    return f'{root}.{tenant}{ext}'
+
+def _encode_doc(doc):
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in doc.items() if key != '_id'}
+
+def _save_disk_snapshot():
+    if not get_store().shared:
+        return
+    ts = tenant_state()
+    with ts.lock:
+        timers = dict(ts.timer_cache['timers'] or {})
+    if not timers:
+        return
+    path = _snapshot_path(ts.tenant)
+    with _disk_snapshot_lock:
+        body = json.dumps({
+            'timers': {name: _encode_doc(doc) for name, doc in timers.items() if doc},
+            'pending': [_encode_doc(doc) for doc in ts.degraded['pending']],
+        }, sort_keys=True)
+        if body == ts.disk_snapshot['body']:
+            return
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write('{"saved_at": "%s", %s' % (utcnow().isoformat(), body[1:]))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning('Could not write timer snapshot to %s: %s', path, e)
+            return
+        ts.disk_snapshot['body'] = body
+
+def _load_disk_snapshot():
+    # install the file's timers as the snapshot; False if there is no usable file
+    ts = tenant_state()
+    path = _snapshot_path(ts.tenant)
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    timers = {name: _normalize_timer(doc) for name, doc in data.get('timers', {}).items()}
+    with _disk_snapshot_lock:
+        if not ts.degraded['pending']:
+            ts.degraded['pending'] = [_normalize_timer(doc) for doc in data.get('pending', [])]
+        ts.degraded['as_of'] = datetime.fromisoformat(data['saved_at'])
+    with ts.lock:
+        cache = ts.timer_cache
+        if cache['timers'] is not None:
+            return True
+        cache['timers'] = timers
+        cache['version'] += 1
+        cache['loaded_at'] = time.monotonic()
+        cache['dirty'] = False
+    logging.warning('Serving %d timers from %s saved at %s', len(timers), path, data['saved_at'])
+    return True
+
+def _enter_degraded(reason):
+    ts = tenant_state()
+    with _disk_snapshot_lock:
+        if ts.degraded['since'] is None:
+            logging.error('Timer store unavailable for %s, serving last known state: %s', ts.tenant, reason)
+            ts.degraded['since'] = utcnow()
+            ts.degraded['as_of'] = ts.degraded['as_of'] or ts.disk_snapshot['confirmed_at']
+    with ts.lock:
+        # keep serving the stale snapshot for a TTL instead of retrying on every read
+        ts.timer_cache['loaded_at'] = time.monotonic()
+
+def _store_recovered():
+    ts = tenant_state()
+    ts.disk_snapshot['confirmed_at'] = utcnow()
+    if ts.degraded['since'] is not None:
+        with _disk_snapshot_lock:
+            logging.warning('Timer store is back for %s after %s', ts.tenant, utcnow() - ts.degraded['since'])
+            ts.degraded['since'] = None
+            ts.degraded['as_of'] = None
+        _replay_pending()
+    _save_disk_snapshot()
+
+def _queue_reset(doc):
+    with _disk_snapshot_lock:
+        tenant_state().degraded['pending'].append(doc)
+    _patch_snapshot(doc['name'], doc)
+    logging.warning('Queued reset of %s by %s until the store is back', doc['name'], doc['user'])
+    return doc
+
+def _replay_pending():
+    ts = tenant_state()
+    with _disk_snapshot_lock:
+        pending, ts.degraded['pending'] = ts.degraded['pending'], []
+    if not pending:
+        return
+    with ts.lock:
+        current = dict(ts.timer_cache['timers'] or {})
+    latest = {}
+    for doc in pending:
+        if doc['name'] not in latest or latest[doc['name']]['kill_time'] < doc['kill_time']:
+            latest[doc['name']] = doc
+    # a kill recorded elsewhere during the outage wins over an older queued one; the
+    # store checks again as it writes, since this snapshot can be behind
+    docs = [
+        doc for doc in latest.values()
+        if not (current.get(doc['name']) or {}).get('kill_time') or current[doc['name']]['kill_time'] < doc['kill_time']
+    ]
+    try:
+        errors = get_store().save_many(docs) if docs else {}
+    except Exception:
+        logging.exception('Replaying %d queued resets failed', len(docs))
+        errors = dict(enumerate(docs))
+    for i, doc in enumerate(docs):
+        if errors.get(i) == STALE_WRITE:
+            continue
+        if i in errors:
+            with _disk_snapshot_lock:
+                ts.degraded['pending'].append(doc)
+            continue
+        _patch_snapshot(doc['name'], doc)
+        record_kill(doc, 'reset')
+    logging.warning('Replayed %d of %d queued resets', len(docs) - len(errors), len(pending))
+
+def _refresh_within_budget():
+    # True once the snapshot is current, False when the last known state is served
+    ts = tenant_state()
+    key = f'timers:{ts.tenant}'
+    # a profiled request loads inline so the store call shows up in its profile
+    if not get_store().shared or (has_request_context() and g.get('profiler')):
+        _single_flight(key, _refresh_timers)
+        return True
+    with _inflight_lock:
+        busy = key in _inflight
+    if busy and ts.degraded['since'] is not None and ts.timer_cache['timers'] is not None:
+        return False
+    outcome = {}
+
+    def refresh():
+        try:
+            with tenant_scope(ts.tenant):
+                _single_flight(key, _refresh_timers)
+        except Exception as e:
+            outcome['error'] = e
+
+    worker = threading.Thread(target=refresh, name='timers-refresh', daemon=True)
+    worker.start()
+    worker.join(STORE_LATENCY_BUDGET)
+    if not worker.is_alive() and 'error' not in outcome:
+        return True
+    error = outcome.get('error') or TimeoutError(f'store load took over {STORE_LATENCY_BUDGET}s')
+    _enter_degraded(error)
+    if ts.timer_cache['timers'] is None and not _load_disk_snapshot():
+        raise error
+    return False
+
+def stale_state():
+    # None while the store is healthy, otherwise what the banner needs
+    degraded = tenant_state().degraded
+    if degraded['since'] is None:
+        return None
+    return {'since': degraded['since'], 'as_of': degraded['as_of'], 'pending': len(degraded['pending'])}
+
+# Server-Sent Events. Each /events connection owns a bounded queue; every
+# timer change is serialized once and fanned out to all of them.
+EVENT_HEARTBEAT_SECONDS = float(os.environ.get('EVENT_HEARTBEAT_SECONDS', '15'))
+EVENT_QUEUE_SIZE = 64
+_subscribers = set()
+_subscribers_lock = threading.Lock()
+
+class _Subscriber:
+    def __init__(self, tenant):
+        self.tenant = tenant
+        self.queue = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self.closed = False
+
+def publish_timer(boss_name, doc):
+    boss = get_boss_by_name(boss_name)
+    if not boss or not _subscribers:
+        return
+    kill_dt, spawn_dt, window_end_dt = timer_instants(boss, doc)
+    data = json.dumps({
+        'name': boss_name,
+        'kill_time': _iso(kill_dt),
+        'spawn_time': _iso(spawn_dt),
+        'window_end_time': _iso(window_end_dt),
+        'user': doc.get('user') if doc else None,
+        'rev': doc.get('rev', 0) if doc else 0,
+    }, separators=(',', ':'))
+    message = f'event: timer\ndata: {data}\n\n'
+    tenant = current_tenant()
+    with _subscribers_lock:
+        for sub in list(_subscribers):
+            if sub.tenant != tenant:
+                continue
+            try:
+                sub.queue.put_nowait(message)
+            except queue.Full:
+                # a stalled client; drop it and let EventSource reconnect
+                sub.closed = True
+                _subscribers.discard(sub)
+
+def _event_stream(sub):
+    try:
+        yield 'retry: 5000\n\n'
+        while not sub.closed:
+            try:
+                yield sub.queue.get(timeout=EVENT_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ': heartbeat\n\n'
+    finally:
+        with _subscribers_lock:
+            _subscribers.discard(sub)
+
+def _ensure_watch():
+    if _watch['started'] or not TIMER_CACHE_WATCH:
+        return
+    _watch['started'] = True
+    threading.Thread(target=_watch_timers, name='timer-watch', daemon=True).start()
+
+# Boss catalog, one per tenant. BOSS_CATALOG may name a JSON file holding a
+# list shaped like BOSSES, or be 'mongo' to read the bosses collection; without
+# it the hardcoded list is used. A tenant's "catalog" setting takes the same
+# values or an inline list. The source is re-checked every
+# BOSS_CATALOG_CHECK_SECONDS and swapped in without a restart.
+BOSS_CATALOG = os.environ.get('BOSS_CATALOG', '')
+BOSS_CATALOG_CHECK_SECONDS = float(os.environ.get('BOSS_CATALOG_CHECK_SECONDS', '5'))
+
+def _build_catalog(entries):
+    bosses = []
+    for entry in entries:
+        respawn_minutes = int(entry['respawn_minutes'])
+        window_minutes = int(entry['window_minutes'])
+        bosses.append({
+            'name': str(entry['name']),
+            'respawn_minutes': respawn_minutes,
+            'window_minutes': window_minutes,
+            'respawn': timedelta(minutes=respawn_minutes),
+            'window': timedelta(minutes=window_minutes),
+        })
+    return bosses, {boss['name']: boss for boss in bosses}
+
+def _catalog_source(tenant):
+    return tenant_setting(tenant, 'catalog', BOSS_CATALOG) or ''
+
+def _read_catalog_source(ts):
+    # (stamp, entries); entries is None when the source is unchanged since the last load
+    source = _catalog_source(ts.tenant)
+    if isinstance(source, list):
+        if ts.catalog['stamp'] == 'inline':
+            return 'inline', None
+        return 'inline', source
+    if source == 'mongo':
+        # no cheap change marker here, so the content is compared instead
+        return None, list(get_db()['bosses'].find(_tenant_match(ts.tenant), {'_id': 0, 'tenant': 0}).sort('order', 1))
+    if source:
+        stamp = os.stat(source).st_mtime_ns
+        if stamp == ts.catalog['stamp']:
+            return stamp, None
+        with open(source) as f:
+            return stamp, json.load(f)
+    if ts.catalog['stamp'] == 'builtin':
+        return 'builtin', None
+    return 'builtin', BOSSES
+
+def reload_catalog(force=True):
+    ts = tenant_state()
+    catalog = ts.catalog
+    with ts.catalog_reload_lock:
+        checked_at = catalog['checked_at']
+        # another thread may have reloaded while we waited for the lock
+        if not force and checked_at is not None and time.monotonic() - checked_at < BOSS_CATALOG_CHECK_SECONDS:
+            return False
+        catalog['checked_at'] = time.monotonic()
+        try:
+            stamp, entries = _read_catalog_source(ts)
+            if entries is None:
+                return False
+            bosses, by_name = _build_catalog(entries)
+        except (OSError, ValueError, KeyError, TypeError, PyMongoError) as e:
+            logging.warning('Keeping current boss catalog for %s, reload failed: %s', ts.tenant, e)
+            return False
+        catalog['stamp'] = stamp
+        if bosses == catalog['bosses']:
+            return False
+        # no card can have been rendered before the first catalog
+        first_load = not catalog['bosses']
+        catalog.update(bosses=bosses, by_name=by_name)
+    source = _catalog_source(ts.tenant)
+    logging.info('Loaded %d bosses for %s from %s', len(bosses), ts.tenant, 'inline list' if isinstance(source, list) else source or 'built-in list')
+    _catalog_changed(all_cards=not first_load)
+    return True
+
+def _catalog_changed(all_cards=True):
+    # anything derived from the snapshot (schedule, API payloads) is keyed on its version
+    ts = tenant_state()
+    with ts.lock:
+        ts.timer_cache['version'] += 1
+        if all_cards:
+            ts.timer_cache['all_changed_at'] = ts.timer_cache['version']
+
+def _current_catalog():
+    catalog = tenant_state().catalog
+    checked_at = catalog['checked_at']
+    if checked_at is None or time.monotonic() - checked_at >= BOSS_CATALOG_CHECK_SECONDS:
+        reload_catalog(force=False)
+    return catalog
+
+def get_bosses():
+    return _current_catalog()['bosses']
+
 # MongoDB timer helpers
+def timers_snapshot():
+    # (version, timers) for read-only callers; the dict must not be mutated
+    _ensure_watch()
+    _count('reads')
+    ts = tenant_state()
+    if _cache_fresh(ts):
+        _count('cache_hits')
+    elif not _refresh_within_budget():
+        _count('stale_reads')
+    with ts.lock:
+        return ts.timer_cache['version'], ts.timer_cache['timers'] or {}
+
 def load_timers():
-    timers = {}
-    for doc in timers_collection.find():
-        timers[doc['name']] = doc
-    return timers
+    _, timers = timers_snapshot()
+    # callers are free to mutate what they get back
+    return {name: dict(doc) for name, doc in timers.items()}
+
+# Several members often confirm the same kill within seconds. A reset less than
+# RESET_DEDUPE_SECONDS after the last one, or a retry with the same idempotency
+# key, is treated as that kill: nothing is written and the current timer is returned.
+RESET_DEDUPE_SECONDS = float(os.environ.get('RESET_DEDUPE_SECONDS', '15'))
+
+def reset_timer(boss, username, reset_id=None):
+    # returns (doc, created); created is False when the reset was a duplicate
+    reset_id = reset_id or uuid.uuid4().hex
+    ts = tenant_state()
+    with ts.lock:
+        cached = (ts.timer_cache['timers'] or {}).get(boss['name'])
+    if _reset_is_duplicate(cached, utcnow(), reset_id, RESET_DEDUPE_SECONDS):
+        inc('timers_resets_deduplicated_total', (('where', 'cache'),))
+        return dict(cached), False
+    if ts.degraded['since'] is not None:
+        return _queue_reset(_reset_doc(boss, username, utcnow(), reset_id)), True
+    try:
+        doc, created = get_store().reset(boss, username, reset_id=reset_id, dedupe_seconds=RESET_DEDUPE_SECONDS)
+    except (PyMongoError, sqlite3.Error) as e:
+        _enter_degraded(e)
+        return _queue_reset(_reset_doc(boss, username, utcnow(), reset_id)), True
+    _patch_snapshot(boss['name'], doc)
+    if not created:
+        inc('timers_resets_deduplicated_total', (('where', 'store'),))
+        return doc, False
+    record_kill(doc, 'reset')
+    return doc, True
+
+def shift_timer(boss_name, minutes):
+    # Moves every stored instant back by `minutes`; returns None if there is no timer.
+    # Unlike a reset, a shift is relative to the stored timer, so it is never queued.
+    try:
+        doc = get_store().shift(boss_name, minutes)
+    except (PyMongoError, sqlite3.Error) as e:
+        _enter_degraded(e)
+        raise
+    if doc:
+        _patch_snapshot(boss_name, doc)
+        record_kill(doc, 'edit')
+    return doc
+
+def bulk_reset_timers(kills, username):
+    # kills is [(boss, kill_dt)]; every timer is written in one store round trip.
+    # Returns a (status, doc) pair per kill: 'ok' or 'queued' with the new document,
+    # 'stale' with the newer timer that is kept (None if only the store knows it),
+    # or 'error' with None.
+    _, timers = timers_snapshot()
+    results = [None] * len(kills)
+    docs, indexes = [], []
+    for i, (boss, kill_dt) in enumerate(kills):
+        current = timers.get(boss['name'])
+        # the store enforces this too; checking the snapshot first saves the write
+        if current and current.get('kill_time') and current['kill_time'] >= kill_dt:
+            results[i] = ('stale', current)
+            continue
+        docs.append(_reset_doc(boss, username, kill_dt, uuid.uuid4().hex))
+        indexes.append(i)
+    degraded = tenant_state().degraded['since'] is not None
+    errors = {}
+    if docs and not degraded:
+        try:
+            errors = get_store().save_many(docs)
+        except (PyMongoError, sqlite3.Error) as e:
+            _enter_degraded(e)
+            degraded = True
+    for j, (i, doc) in enumerate(zip(indexes, docs)):
+        if degraded:
+            results[i] = ('queued', _queue_reset(doc))
+        elif errors.get(j) == STALE_WRITE:
+            # another instance or a racing reset got there first; our snapshot is behind
+            ts = tenant_state()
+            with ts.lock:
+                ts.timer_cache['dirty'] = True
+            results[i] = ('stale', None)
+        elif j in errors:
+            logging.warning('Bulk reset of %s failed: %s', doc['name'], errors[j])
+            results[i] = ('error', None)
+        else:
+            _patch_snapshot(doc['name'], doc)
+            record_kill(doc, 'import')
+            results[i] = ('ok', doc)
+    return results
+
+# Kill history. Every reset and edit is appended to the store's kill log, but
+# through a buffer: a background writer flushes it every KILL_FLUSH_SECONDS or
+# once KILL_BATCH_SIZE records are waiting, so the reset path never waits on it.
+# Buffered records are (tenant, kill) pairs; each tenant's go to its own store.
+KILL_BATCH_SIZE = int(os.environ.get('KILL_BATCH_SIZE', '50'))
+KILL_FLUSH_SECONDS = float(os.environ.get('KILL_FLUSH_SECONDS', '2'))
+# Serverless runtimes (VERCEL is set there) may freeze or kill the process
+# between requests and lose whatever is still buffered, so with KILL_FLUSH_SYNC
+# a request that recorded kills writes them before its response goes out.
+KILL_FLUSH_SYNC = os.environ.get('KILL_FLUSH_SYNC', '1' if os.environ.get('VERCEL') else '0') == '1'
+_kill_buffer = []
+_kill_buffer_lock = threading.Lock()
+_kill_flush_wanted = threading.Event()
+_kill_writer_started = False
+
+def record_kill(doc, action):
+    global _kill_writer_started
+    if not doc or not doc.get('kill_time'):
+        return
+    kill = {
+        # fixed here so a retried flush can't store the record twice
+        '_id': ObjectId(),
+        'name': doc['name'],
+        'kill_time': doc['kill_time'],
+        'user': doc.get('user'),
+        'action': action,
+        'recorded_at': utcnow(),
+    }
+    if has_request_context():
+        g.kills_recorded = True
+    with _kill_buffer_lock:
+        _kill_buffer.append((current_tenant(), kill))
+        full = len(_kill_buffer) >= KILL_BATCH_SIZE
+        if not _kill_writer_started:
+            _kill_writer_started = True
+            threading.Thread(target=_kill_writer, name='kill-writer', daemon=True).start()
+    if full:
+        _kill_flush_wanted.set()
+
+def flush_kills():
+    with _kill_buffer_lock:
+        batch = _kill_buffer[:]
+        del _kill_buffer[:]
+    by_tenant = {}
+    for tenant, kill in batch:
+        by_tenant.setdefault(tenant, []).append(kill)
+    written = 0
+    for tenant, kills in by_tenant.items():
+        try:
+            errors = get_store(tenant).append_kills(kills)
+        except Exception:
+            # the write may still have landed; the records' _ids make the retry harmless
+            logging.exception('Kill history write failed for %s, will retry %d records', tenant, len(kills))
+            errors = dict.fromkeys(range(len(kills)))
+        if errors:
+            if len(errors) < len(kills):
+                logging.warning('Kill history write failed for %d of %d records for %s, will retry them', len(errors), len(kills), tenant)
+            with _kill_buffer_lock:
+                _kill_buffer[:0] = [(tenant, kills[i]) for i in sorted(errors)]
+        written += len(kills) - len(errors)
+    return written
+
+def _kill_writer():
+    while True:
+        _kill_flush_wanted.wait(KILL_FLUSH_SECONDS)
+        _kill_flush_wanted.clear()
+        flush_kills()
+
+atexit.register(flush_kills)
+
+@app.after_request
+def _flush_recorded_kills(response):
+    if KILL_FLUSH_SYNC and g.get('kills_recorded'):
+        flush_kills()
+    return response
+
+# Spawn statistics. For each boss we keep running statistics of observed
+# kill-to-kill intervals: Welford mean/variance plus a fixed-bin histogram
+# spanning the spawn window, which gives quantiles and the most likely spawn
+# offset. Every update is O(1). The state is seeded once per process from the
+# latest STATS_SEED_LIMIT kills, in a single query; after that, resets and edits
+# arriving through the snapshot update it incrementally. /api/spawn-stats seeds
+# on demand; the dashboard never waits for it and shows no estimate until a
+# background seed has finished.
+STATS_MAX_BINS = 48
+STATS_MIN_SAMPLES = int(os.environ.get('STATS_MIN_SAMPLES', '3'))
+STATS_SEED_LIMIT = int(os.environ.get('STATS_SEED_LIMIT', '5000'))
+
+def _new_spawn_stats(shape=None):
+    return {
+        'shape': shape,
+        'count': 0,
+        'mean': 0.0,
+        'm2': 0.0,
+        'bins': None,
+        'outliers': 0,
+        'last_kill': None,
+        'prev_kill': None,
+        'last_interval': None,
+    }
+
+def _stats_bin_count(boss):
+    # roughly one-minute bins for short windows, capped for the day-long ones
+    return max(1, min(STATS_MAX_BINS, boss['window_minutes']))
+
+def _stats_bin(st, boss, minutes):
+    if st['bins'] is None or len(st['bins']) != _stats_bin_count(boss):
+        st['bins'] = [0] * _stats_bin_count(boss)
+    offset = (minutes - boss['respawn_minutes']) / max(boss['window_minutes'], 1)
+    return min(len(st['bins']) - 1, max(0, int(offset * len(st['bins']))))
+
+def _boss_stats(bosses, boss):
+    # state built for one respawn and window says nothing about another, so a
+    # catalog reload that changes either starts the boss over; caller holds the lock
+    shape = (boss['respawn_minutes'], boss['window_minutes'])
+    st = bosses.get(boss['name'])
+    if st is None or st['shape'] != shape:
+        st = bosses[boss['name']] = _new_spawn_stats(shape)
+    return st
+
+def _stats_add(st, boss, minutes):
+    st['count'] += 1
+    delta = minutes - st['mean']
+    st['mean'] += delta / st['count']
+    st['m2'] += delta * (minutes - st['mean'])
+    i = _stats_bin(st, boss, minutes)
+    st['bins'][i] += 1
 
-def save_timer(boss_name, timer_data):
-    timers_collection.update_one({'name': boss_name}, {'$set': timer_data}, upsert=True)
+def _stats_remove(st, boss, minutes):
+    # exact inverse of _stats_add, used when an edit corrects the latest kill
+    if st['count'] <= 1:
+        st.update(count=0, mean=0.0, m2=0.0)
+    else:
+        mean_before = (st['mean'] * st['count'] - minutes) / (st['count'] - 1)
+        st['m2'] -= (minutes - st['mean']) * (minutes - mean_before)
+        st['mean'] = mean_before
+        st['count'] -= 1
+    i = _stats_bin(st, boss, minutes)
+    st['bins'][i] -= 1
+
+def _stats_interval(st, boss):
+    # count the interval between the last two kills if it falls inside the spawn window
+    st['last_interval'] = None
+    if st['prev_kill'] is None:
+        return
+    minutes = (st['last_kill'] - st['prev_kill']).total_seconds() / 60
+    if boss['respawn_minutes'] <= minutes <= boss['respawn_minutes'] + boss['window_minutes']:
+        _stats_add(st, boss, minutes)
+        st['last_interval'] = minutes
+    else:
+        # a late kill (nobody was there at spawn) or a double reset says nothing about the window
+        st['outliers'] += 1
+
+def _stats_kill(st, boss, kill_time):
+    if st['last_kill'] is not None and kill_time == st['last_kill']:
+        return
+    if st['last_kill'] is not None and kill_time < st['last_kill']:
+        # an edit moved the latest kill back; replace its interval
+        if st['last_interval'] is not None:
+            _stats_remove(st, boss, st['last_interval'])
+        elif st['prev_kill'] is not None:
+            st['outliers'] -= 1
+        st['last_kill'] = kill_time
+    else:
+        st['prev_kill'], st['last_kill'] = st['last_kill'], kill_time
+    _stats_interval(st, boss)
+
+def _seed_spawn_stats(ts):
+    # the store is queried without holding the lock, so readers never wait on it
+    flush_kills()
+    kills = get_store().query_kills(limit=STATS_SEED_LIMIT)
+    bosses = {}
+    # replay in the order they were recorded so edits correct the right kill
+    for kill in sorted(kills, key=lambda k: k.get('recorded_at') or k['kill_time']):
+        boss = get_boss_by_name(kill['name'])
+        if boss:
+            _stats_kill(_boss_stats(bosses, boss), boss, kill['kill_time'])
+    with ts.spawn_stats_lock:
+        if not ts.spawn_stats['seeded']:
+            ts.spawn_stats.update(bosses=bosses, seeded=True)
+
+def _seed_spawn_stats_later():
+    ts = tenant_state()
+    with ts.spawn_stats_lock:
+        if ts.spawn_stats['seeded'] or ts.spawn_stats['seeding']:
+            return
+        ts.spawn_stats['seeding'] = True
+
+    def seed():
+        try:
+            with tenant_scope(ts.tenant):
+                _seed_spawn_stats(ts)
+        except Exception as e:
+            logging.warning('Seeding spawn stats for %s failed, will retry: %s', ts.tenant, e)
+        finally:
+            ts.spawn_stats['seeding'] = False
+
+    threading.Thread(target=seed, name='spawn-stats-seed', daemon=True).start()
+
+def observe_kill(boss_name, doc):
+    ts = tenant_state()
+    boss = get_boss_by_name(boss_name)
+    if not ts.spawn_stats['seeded'] or not boss or not doc or not doc.get('kill_time'):
+        return
+    with ts.spawn_stats_lock:
+        st = _boss_stats(ts.spawn_stats['bosses'], boss)
+        _stats_kill(st, boss, doc['kill_time'])
+
+def _stats_quantile(boss, bins, count, q):
+    target = q * count
+    seen = 0
+    width = max(boss['window_minutes'], 1) / len(bins)
+    for i, n in enumerate(bins):
+        if n and seen + n >= target:
+            return boss['respawn_minutes'] + width * (i + (target - seen) / n)
+        seen += n
+    return None
+
+def spawn_stats(boss_name):
+    # summary in minutes after the kill, or None for an unknown boss
+    boss = get_boss_by_name(boss_name)
+    if not boss:
+        return None
+    ts = tenant_state()
+    if not ts.spawn_stats['seeded']:
+        _seed_spawn_stats(ts)
+    with ts.spawn_stats_lock:
+        st = dict(_boss_stats(ts.spawn_stats['bosses'], boss))
+        bins = list(st['bins'] or [])
+    count = st['count']
+    summary = {
+        'count': count,
+        'outliers': st['outliers'],
+        'mean_minutes': round(st['mean'], 2) if count else None,
+        'stddev_minutes': round((st['m2'] / (count - 1)) ** 0.5, 2) if count > 1 else None,
+        'p10_minutes': None,
+        'p50_minutes': None,
+        'p90_minutes': None,
+        'mode_minutes': None,
+        'likely_spawn_time': None,
+    }
+    quantiles = {q: _stats_quantile(boss, bins, count, q / 100) for q in (10, 50, 90)} if count and bins else {}
+    # bins that don't add up to count give no estimate rather than a wrong one
+    if quantiles and None not in quantiles.values():
+        for q, minutes in quantiles.items():
+            summary[f'p{q}_minutes'] = round(minutes, 2)
+        width = max(boss['window_minutes'], 1) / len(bins)
+        centers = [boss['respawn_minutes'] + width * (i + 0.5) for i in range(len(bins))]
+        # busiest bin; ties go to the one closest to the median
+        mode_bin = max(range(len(bins)), key=lambda i: (bins[i], -abs(centers[i] - summary['p50_minutes'])))
+        summary['mode_minutes'] = round(centers[mode_bin], 2)
+        if count >= STATS_MIN_SAMPLES and st['last_kill']:
+            summary['likely_spawn_time'] = st['last_kill'] + timedelta(minutes=summary['mode_minutes'])
+    return summary
+
+# Spawn alerts. Pending notifications sit in a hierarchical timing wheel:
+# four levels of 64 slots at 1s, 64s, ~68min and ~3 day resolution. Adding an
+# alert is O(1), and each tick touches one slot plus, at level boundaries, one
+# cascading slot, however many alerts are pending. A timer change bumps the
+# boss's generation, so alerts for the old timer are dropped when they come
+# due instead of being searched for. Alerts are sent in batches to the sinks
+# named in ALERT_SINKS and retried with backoff. The scheduler needs a
+# long-running process; it stays off unless ALERT_SINKS is set. Timers are
+# reloaded every TIMER_CACHE_TTL so resets made elsewhere are rescheduled.
+# On MongoDB every instance keeps a wheel, but only the holder of a lease in
+# the 'leases' collection delivers, so N instances don't send N webhooks; a
+# standby takes over once the lease lapses. With the other stores, run
+# ALERT_SINKS on a single process.
+ALERT_SINKS = [name for name in os.environ.get('ALERT_SINKS', '').split(',') if name]
+ALERT_WEBHOOK_URL = os.environ.get('ALERT_WEBHOOK_URL', '')
+# "event:minutes_before" pairs; event is spawn or window_end
+ALERT_OFFSETS = [
+    (event, float(minutes))
+    for event, minutes in (item.split(':') for item in os.environ.get('ALERT_OFFSETS', 'spawn:5,spawn:0,window_end:5').split(','))
+]
+ALERT_TICK_SECONDS = 1
+ALERT_BATCH_SIZE = int(os.environ.get('ALERT_BATCH_SIZE', '50'))
+ALERT_MAX_ATTEMPTS = int(os.environ.get('ALERT_MAX_ATTEMPTS', '5'))
+ALERT_LEASE_SECONDS = float(os.environ.get('ALERT_LEASE_SECONDS', '15'))
+_ALERT_OWNER = uuid.uuid4().hex
+
+class TimingWheel:
+    def __init__(self, now, slots=64, levels=4):
+        self.slots = slots
+        self.levels = levels
+        self.now = int(now)
+        self.wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.overflow = []
+        self.size = 0
+
+    def add(self, when, item):
+        self.size += 1
+        self._place(int(when), item, None)
+
+    def _place(self, when, item, due):
+        delta = when - self.now
+        if delta <= 0 and due is not None:
+            due.append(item)
+            self.size -= 1
+            return
+        delta = max(delta, 1)
+        when = self.now + delta
+        for level in range(self.levels):
+            if delta < self.slots ** (level + 1):
+                self.wheels[level][(when // self.slots ** level) % self.slots].append((when, item))
+                return
+        self.overflow.append((when, item))
+
+    def advance(self, to):
+        # move the clock to `to` (epoch seconds) and return every item that came due
+        due = []
+        while self.now < to:
+            self.now += 1
+            if self.now % self.slots ** self.levels == 0:
+                overflow, self.overflow = self.overflow, []
+                for when, item in overflow:
+                    self._place(when, item, due)
+            for level in range(self.levels - 1, 0, -1):
+                span = self.slots ** level
+                if self.now % span == 0:
+                    slot = (self.now // span) % self.slots
+                    bucket, self.wheels[level][slot] = self.wheels[level][slot], []
+                    for when, item in bucket:
+                        self._place(when, item, due)
+            slot = self.now % self.slots
+            bucket, self.wheels[0][slot] = self.wheels[0][slot], []
+            for when, item in bucket:
+                self._place(when, item, due)
+        return due
+
+class LogAlertSink:
+    name = 'log'
+
+    def send(self, alerts):
+        for alert in alerts:
+            logging.info('Alert: %s/%s %s in %s minutes (%s)', alert['tenant'], alert['boss'], alert['event'], alert['minutes_before'], alert['at'])
+
+class WebhookAlertSink:
+    name = 'webhook'
+
+    def __init__(self, url):
+        self.url = url
+
+    def send(self, alerts):
+        body = json.dumps({'alerts': alerts}).encode()
+        req = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'}, method='POST')
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            resp.read()
+
+class QueueAlertSink:
+    # in-process delivery for other code in this worker
+    name = 'queue'
+
+    def __init__(self, maxsize=1000):
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def send(self, alerts):
+        for alert in alerts:
+            self.queue.put_nowait(alert)
+
+_alert_sinks = {}
+_alerts = {
+    'wheel': None,
+    'generations': {},
+    'scheduled': {},
+    'started': False,
+    'lease': (False, 0.0),
+}
+_alerts_lock = threading.Lock()
+
+def register_alert_sink(sink):
+    _alert_sinks[sink.name] = sink
+    _start_alerts()
+
+def _configure_alert_sinks():
+    for name in ALERT_SINKS:
+        if name == 'log':
+            _alert_sinks[name] = LogAlertSink()
+        elif name == 'webhook' and ALERT_WEBHOOK_URL:
+            _alert_sinks[name] = WebhookAlertSink(ALERT_WEBHOOK_URL)
+        elif name == 'queue':
+            _alert_sinks[name] = QueueAlertSink()
+        else:
+            logging.warning('Unknown or unconfigured alert sink: %s', name)
+
+def _epoch_seconds(dt):
+    return (dt - _EPOCH).total_seconds()
+
+def schedule_alerts(boss_name, doc):
+    if not _alert_sinks:
+        return
+    boss = get_boss_by_name(boss_name)
+    _, spawn_dt, window_end_dt = timer_instants(boss, doc) if boss else (None, None, None)
+    key = (current_tenant(), boss_name)
+    with _alerts_lock:
+        if _alerts['scheduled'].get(key) == (spawn_dt, window_end_dt):
+            return
+        _alerts['scheduled'][key] = (spawn_dt, window_end_dt)
+        generation = _alerts['generations'][key] = _alerts['generations'].get(key, 0) + 1
+        if spawn_dt is None:
+            return
+        if _alerts['wheel'] is None:
+            _alerts['wheel'] = TimingWheel(time.time())
+        now = time.time()
+        for event, minutes in ALERT_OFFSETS:
+            at = spawn_dt if event == 'spawn' else window_end_dt
+            fire_at = _epoch_seconds(at) - minutes * 60
+            if fire_at <= now:
+                continue
+            _alerts['wheel'].add(fire_at, {
+                'tenant': key[0],
+                'boss': boss_name,
+                'event': event,
+                'minutes_before': minutes,
+                'at': _iso(at),
+                'generation': generation,
+                'attempts': 0,
+                'sinks': None,
+            })
+
+def _deliver_alerts(alerts):
+    for name, sink in list(_alert_sinks.items()):
+        pending = [a for a in alerts if a['sinks'] is None or name in a['sinks']]
+        for i in range(0, len(pending), ALERT_BATCH_SIZE):
+            batch = pending[i:i + ALERT_BATCH_SIZE]
+            try:
+                sink.send([{k: a[k] for k in ('tenant', 'boss', 'event', 'minutes_before', 'at')} for a in batch])
+            except Exception as e:
+                logging.warning('Alert sink %s failed for %d alerts: %s', name, len(batch), e)
+                _retry_alerts(batch, name)
+
+def _retry_alerts(batch, sink_name):
+    with _alerts_lock:
+        for alert in batch:
+            if alert['attempts'] + 1 >= ALERT_MAX_ATTEMPTS:
+                logging.error('Dropping alert for %s after %d attempts', alert['boss'], ALERT_MAX_ATTEMPTS)
+                continue
+            retry = dict(alert, attempts=alert['attempts'] + 1, sinks=[sink_name])
+            _alerts['wheel'].add(time.time() + 2 ** retry['attempts'], retry)
+
+def _refresh_alert_timers():
+    # loading the snapshots schedules alerts for every current timer
+    for tenant in _tenant_configs:
+        try:
+            with tenant_scope(tenant):
+                timers_snapshot()
+        except Exception:
+            logging.exception('Timer load for alerts failed for %s', tenant)
+
+def _holds_alert_lease():
+    if TIMER_STORE != 'mongo':
+        return True
+    held, checked_at = _alerts['lease']
+    # renew well before the lease runs out
+    if time.monotonic() - checked_at < ALERT_LEASE_SECONDS / 3:
+        return held
+    now = utcnow()
+    try:
+        get_db()['leases'].find_one_and_update(
+            {'_id': 'alerts', '$or': [{'owner': _ALERT_OWNER}, {'expires_at': {'$lt': now}}]},
+            {'$set': {'owner': _ALERT_OWNER, 'expires_at': now + timedelta(seconds=ALERT_LEASE_SECONDS)}},
+            upsert=True,
+        )
+        held = True
+    except DuplicateKeyError:
+        # the filter missed because another instance holds a live lease
+        held = False
+    except PyMongoError as e:
+        logging.warning('Alert lease check failed, not delivering: %s', e)
+        held = False
+    if held != _alerts['lease'][0]:
+        logging.info('Alert delivery %s on this instance', 'active' if held else 'on standby')
+    _alerts['lease'] = (held, time.monotonic())
+    return held
+
+def _alert_loop():
+    _refresh_alert_timers()
+    refreshed_at = time.monotonic()
+    while True:
+        time.sleep(ALERT_TICK_SECONDS)
+        if time.monotonic() - refreshed_at >= TIMER_CACHE_TTL:
+            _refresh_alert_timers()
+            refreshed_at = time.monotonic()
+        with _alerts_lock:
+            wheel = _alerts['wheel']
+            fired = wheel.advance(int(time.time())) if wheel else []
+            live = [a for a in fired if _alerts['generations'].get((a['tenant'], a['boss'])) == a['generation']]
+        if live and _holds_alert_lease():
+            _deliver_alerts(live)
+
+def _start_alerts():
+    with _alerts_lock:
+        if _alerts['started'] or not _alert_sinks:
+            return
+        _alerts['started'] = True
+    threading.Thread(target=_alert_loop, name='alert-scheduler', daemon=True).start()
+
+def migrate_timers(legacy_path=None):
+    # MongoDB only. One-shot conversion of ISO-string timers to BSON dates and of
+    # untagged timers and kills to the default tenant, optionally seeding the current
+    # tenant from the old bosses.json shape ({name: {"kill_time": ..., "user": ...}}).
+    # It also creates every timer and kill index the stores rely on.
+    collection = get_timers_collection()
+    tenant = current_tenant()
+    converted = imported = 0
+    for doc in collection.find({'$or': [{key: {'$type': 'string'}} for key in TIME_FIELDS]}):
+        update = {key: datetime.fromisoformat(doc[key]) for key in TIME_FIELDS if isinstance(doc.get(key), str)}
+        collection.update_one({'_id': doc['_id']}, {'$set': update, '$inc': {'rev': 1}})
+        converted += 1
+    if legacy_path:
+        with open(legacy_path) as f:
+            legacy = json.load(f)
+        for name, entry in legacy.items():
+            boss = get_boss_by_name(name)
+            if not boss or not entry or not entry.get('kill_time'):
+                continue
+            kill_dt = _bson_time(datetime.fromisoformat(entry['kill_time']))
+            spawn_dt = kill_dt + boss['respawn']
+            timer_data = {
+                'name': name,
+                'kill_time': kill_dt,
+                'spawn_time': spawn_dt,
+                'window_end_time': spawn_dt + boss['window'],
+                'user': entry.get('user', 'N/A'),
+            }
+            timer_data['tenant'] = tenant
+            existing = collection.find_one(dict(_tenant_match(tenant), name=name))
+            # never clobber a newer kill that is already in the database
+            if existing and existing.get('kill_time') and existing['kill_time'] >= kill_dt:
+                continue
+            collection.update_one(dict(_tenant_match(tenant), name=name), {'$set': timer_data, '$inc': {'rev': 1}}, upsert=True)
+            imported += 1
+    # every timer write bumps rev so pages holding the old revs pick the change up
+    collection.update_many({'tenant': {'$exists': False}}, {'$set': {'tenant': DEFAULT_TENANT}, '$inc': {'rev': 1}})
+    get_db()['kills'].update_many({'tenant': {'$exists': False}}, {'$set': {'tenant': DEFAULT_TENANT}})
+    # boss names are only unique within a tenant now
+    if 'name_1' in collection.index_information():
+        collection.drop_index('name_1')
+    collection.create_index([('tenant', 1), ('name', 1)], unique=True)
+    collection.create_index('spawn_time')
+    kills = get_db()['kills']
+    kills.create_index([('tenant', 1), ('kill_time', -1)])
+    kills.create_index([('tenant', 1), ('name', 1), ('kill_time', -1)])
+    kills.create_index([('tenant', 1), ('user', 1), ('kill_time', -1)])
+    invalidate_timers()
+    return converted, imported
 
 def get_boss_by_name(name):
-    for boss in BOSSES:
-        if boss['name'] == name:
-            return boss
+    return _current_catalog()['by_name'].get(name)
+
+def timer_instants(boss, timer_entry):
+    # (kill, spawn, window_end) for a boss, filling in instants older documents lack
+    last_kill = timer_entry.get('kill_time') if timer_entry else None
+    if not last_kill:
+        return None, None, None
+    spawn_dt = timer_entry.get('spawn_time') or last_kill + boss['respawn']
+    window_end_dt = timer_entry.get('window_end_time') or spawn_dt + boss['window']
+    return last_kill, spawn_dt, window_end_dt
+
+def _iso(dt):
+    return dt.isoformat(timespec='milliseconds') + 'Z' if dt else None
+
+# JSON timers API. The body only changes when the snapshot does, so it is
+# built once per snapshot version and its hash doubles as a strong ETag.
+# Tokens in API_TOKENS belong to the default tenant.
+API_TOKENS = {t for t in os.environ.get('API_TOKENS', '').split(',') if t}
+
+def _bearer_token():
+    auth = request.headers.get('Authorization', '')
+    if auth.startswith('Bearer '):
+        return auth[7:]
+    # calendar apps can't send headers, so feeds take the token in the URL
+    if request.path.startswith('/feeds/'):
+        return request.args.get('token')
     return None
 
+def api_authorized():
+    if 'username' in session:
+        return True
+    token = _bearer_token()
+    return bool(token) and _token_tenant(token) is not None
+
+def _build_timers_body(timers):
+    bosses = []
+    for boss in get_bosses():
+        timer_entry = timers.get(boss['name'])
+        kill_dt, spawn_dt, window_end_dt = timer_instants(boss, timer_entry)
+        bosses.append({
+            'name': boss['name'],
+            'respawn_minutes': boss['respawn_minutes'],
+            'window_minutes': boss['window_minutes'],
+            'kill_time': _iso(kill_dt),
+            'spawn_time': _iso(spawn_dt),
+            'window_end_time': _iso(window_end_dt),
+            'user': timer_entry.get('user') if timer_entry else None,
+        })
+    return json.dumps({'bosses': bosses}, separators=(',', ':')).encode()
+
+def timers_payload():
+    version, timers = timers_snapshot()
+    api_cache = cached = tenant_state().api_timers_cache
+    if cached['version'] != version:
+        body = _build_timers_body(timers)
+        cached = {'version': version, 'body': body, 'etag': hashlib.sha1(body).hexdigest()}
+        api_cache.update(cached)
+    return cached['body'], cached['etag']
+
 def format_remaining(td):
     if td is None or td.total_seconds() <= 0:
         return 'Ready!'
@@ -100,89 +2131,612 @@ def format_remaining(td):
     minutes, seconds = divmod(remainder, 60)
     return f'{hours:02d}:{minutes:02d}:{seconds:02d}'
 
+# Static assets are served under a content hash so browsers can cache them forever.
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+def _hash_assets():
+    hashes = {}
+    for name in os.listdir(app.static_folder):
+        with open(os.path.join(app.static_folder, name), 'rb') as f:
+            hashes[name] = hashlib.sha1(f.read()).hexdigest()[:12]
+    return hashes
+
+_asset_hashes = _hash_assets()
+
+def asset_url(name):
+    stem, ext = os.path.splitext(name)
+    return url_for('asset', filename=f'{stem}.{_asset_hashes[name]}{ext}')
+
+@app.context_processor
+def inject_asset_url():
+    return {'asset_url': asset_url}
+
+@app.route('/assets/<filename>')
+def asset(filename):
+    stem, ext = os.path.splitext(filename)
+    name, _, digest = stem.rpartition('.')
+    if not name or _asset_hashes.get(name + ext) != digest:
+        abort(404)
+    response = send_from_directory(app.static_folder, name + ext, max_age=ASSET_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
+
+@app.before_request
+def _record_first_request():
+    g.request_started = time.perf_counter()
+
+@app.before_request
+def _resolve_tenant():
+    # a bearer token names its tenant; a browser session carries the one it logged in to
+    token = _bearer_token()
+    tenant = _token_tenant(token) if token and 'username' not in session else session.get('tenant')
+    g.tenant = tenant if tenant in _tenant_configs else DEFAULT_TENANT
+
+@app.after_request
+def _record_first_response(response):
+    if 'first_request' not in startup_timings:
+        record_startup('first_request', g.request_started)
+        _first_request['path'] = request.path
+        record_startup('first_response_since_start', _process_started)
+    return response
+
+@app.after_request
+def _record_request_metrics(response):
+    route = request.endpoint or 'unmatched'
+    observe('timers_request_duration_seconds', (('route', route), ('method', request.method)), time.perf_counter() - g.request_started)
+    inc('timers_responses_total', (('route', route), ('status', str(response.status_code))))
+    # streamed responses (SSE) have no length up front
+    if not response.is_streamed:
+        inc('timers_response_bytes_total', (('route', route),), response.calculate_content_length() or 0)
+    return response
+
+# On-demand profiling. An admin adds ?_profile=1 (or an X-Profile: 1 header)
+# to any route; that request runs under cProfile and the dump is written to
+# PROFILE_DIR/<tenant> as a .prof file (snakeviz, gprof2dot, flameprof all read it).
+# ?_profile=text returns the top of the pstats report instead of the page.
+# Admins only list and download their own tenant's dumps.
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'timer-profiles'))
+
+def _profile_dir(tenant):
+    return os.path.join(PROFILE_DIR, tenant)
+
+def _profile_mode():
+    mode = request.args.get('_profile') or request.headers.get('X-Profile')
+    if mode and session.get('username') in tenant_admins(current_tenant()):
+        return mode
+    return None
+
+@app.before_request
+def _start_profile():
+    g.profile_mode = _profile_mode()
+    if g.profile_mode:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows only one active profiler per process
+            return
+        g.profiler = profiler
+
+@app.after_request
+def _finish_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    directory = _profile_dir(current_tenant())
+    os.makedirs(directory, exist_ok=True)
+    name = f'{datetime.utcnow():%Y%m%dT%H%M%S}-{request.endpoint or "unmatched"}-{uuid.uuid4().hex[:8]}.prof'
+    profiler.dump_stats(os.path.join(directory, name))
+    if g.profile_mode == 'text':
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(60)
+        response = Response(out.getvalue(), mimetype='text/plain')
+    response.headers['X-Profile-Id'] = name
+    return response
+
+@app.route('/profiles', methods=['GET'])
+def profiles():
+    if session.get('username') not in tenant_admins(current_tenant()):
+        abort(403)
+    directory = _profile_dir(current_tenant())
+    names = sorted(os.listdir(directory), reverse=True) if os.path.isdir(directory) else []
+    return jsonify({'profiles': names[:100]})
+
+@app.route('/profiles/<name>', methods=['GET'])
+def profile_dump(name):
+    if session.get('username') not in tenant_admins(current_tenant()):
+        abort(403)
+    return send_from_directory(_profile_dir(current_tenant()), name, as_attachment=True)
+
 @app.errorhandler(Exception)
 def handle_exception(e):
+    if isinstance(e, HTTPException):
+        return e
     import traceback
     print(traceback.format_exc())
     return "Internal Server Error", 500
 
+def boss_card(boss, timer_entry, now):
+    # the page renders the countdowns once; dashboard.js keeps them running from spawn_at/window_end_at
+    last_user = timer_entry.get('user', 'N/A') if timer_entry else 'N/A'
+    last_kill, spawn_dt, window_end_dt = timer_instants(boss, timer_entry)
+    if last_kill:
+        respawn_remaining = spawn_dt - now
+        window_remaining = window_end_dt - now
+    if last_kill and respawn_remaining.total_seconds() <= 0:
+        window_end_display = format_remaining(window_remaining)
+    else:
+        window_end_display = ''
+    return {
+        'name': boss['name'],
+        'respawn': format_remaining(respawn_remaining) if last_kill else 'N/A',
+        'spawn_at': _to_epoch_ms(spawn_dt) if last_kill else '',
+        'window_end': window_end_display if last_kill else 'N/A',
+        'window_end_at': _to_epoch_ms(window_end_dt) if last_kill else '',
+        'last_kill': last_kill.strftime('%Y-%m-%d %H:%M UTC') if last_kill else 'N/A',
+        'last_user': last_user,
+        'likely_spawn': _likely_spawn(boss, last_kill),
+        'rev': timer_entry.get('rev', 0) if timer_entry else 0,
+    }
+
+def _likely_spawn(boss, last_kill):
+    if not last_kill:
+        return ''
+    ts = tenant_state()
+    if not ts.spawn_stats['seeded']:
+        # no point hitting a store that is known to be down on every render
+        if ts.degraded['since'] is None:
+            _seed_spawn_stats_later()
+        return ''
+    summary = spawn_stats(boss['name'])
+    if not summary or summary['count'] < STATS_MIN_SAMPLES or summary['mode_minutes'] is None:
+        return ''
+    return (last_kill + timedelta(minutes=summary['mode_minutes'])).strftime('%H:%M UTC')
+
 @app.route('/', methods=['GET'])
 def index():
     if 'username' not in session:
         flash('You must be logged in to view timers.', 'danger')
         return redirect(url_for('login'))
-    timers = load_timers()
-    now = datetime.utcnow()
-    due_bosses = []
-    not_due_bosses = []
-    for boss in BOSSES:
-        timer_entry = timers.get(boss['name'])
-        if timer_entry:
-            last_kill = timer_entry.get('kill_time')
-            last_user = timer_entry.get('user', 'N/A')
-            spawn_time = timer_entry.get('spawn_time')
-            window_end_time = timer_entry.get('window_end_time')
-        else:
-            last_kill = None
-            last_user = 'N/A'
-            spawn_time = None
-            window_end_time = None
-        if last_kill:
-            last_kill_dt = datetime.fromisoformat(last_kill)
-            if spawn_time:
-                spawn_dt = datetime.fromisoformat(spawn_time)
-            else:
-                spawn_dt = last_kill_dt + timedelta(minutes=boss['respawn_minutes'])
-            if window_end_time:
-                window_end_dt = datetime.fromisoformat(window_end_time)
+    now = utcnow()
+    with timed_phase('fetch'):
+        _, timers = timers_snapshot()
+    with timed_phase('compute'):
+        due_bosses, not_due_bosses = dashboard_cards(now, timers)
+    username = session.get('username')
+    with timed_phase('render'):
+        return render_template(
+            'index.html', bosses=not_due_bosses, due_bosses=due_bosses, username=username, now=datetime.utcnow,
+            stale=stale_state(), server_now=_to_epoch_ms(now),
+        )
+
+def dashboard_cards(now, timers, names=None):
+    # (due, upcoming) card dicts in display order, limited to `names` when given
+    due, upcoming = spawn_schedule(now, timers=timers)
+    scheduled = {entry[0] for entry in due + upcoming}
+    wanted = (lambda name: name in names) if names is not None else (lambda name: True)
+    due_bosses = [boss_card(get_boss_by_name(entry[0]), timers.get(entry[0]), now) for entry in due if wanted(entry[0])]
+    not_due_bosses = [boss_card(get_boss_by_name(entry[0]), timers.get(entry[0]), now) for entry in upcoming if wanted(entry[0])]
+    # bosses that have never been reset go last, in roster order
+    not_due_bosses += [boss_card(boss, None, now) for boss in get_bosses() if boss['name'] not in scheduled and wanted(boss['name'])]
+    return due_bosses, not_due_bosses
+
+@app.route('/fragment', methods=['GET', 'POST'])
+def fragment():
+    # POST {"revs": {<boss>: <rev of its card>}} for every card on the page; returns
+    # rendered cards for just the bosses whose rev moved, or every card on a GET or
+    # when the page's roster is out of date
+    if 'username' not in session:
+        return jsonify({'error': 'login required'}), 401
+    now = utcnow()
+    with timed_phase('fetch'):
+        _, timers = timers_snapshot()
+        body = request.get_json(silent=True) if request.method == 'POST' else None
+        names = changed_cards(timers, body.get('revs') if isinstance(body, dict) else None)
+        ts = tenant_state()
+        with ts.lock:
+            revision = ts.timer_cache['revision']
+    with timed_phase('compute'):
+        due_bosses, not_due_bosses = dashboard_cards(now, timers, None if names is None else set(names))
+    template = app.jinja_env.get_template('card.html')
+    username = session.get('username')
+    with timed_phase('render'):
+        cards = [
+            {'name': boss['name'], 'due': due, 'html': template.render(boss=boss, due=due, username=username)}
+            for due, bosses in ((True, due_bosses), (False, not_due_bosses))
+            for boss in bosses
+        ]
+    return jsonify({'revision': revision, 'full': names is None, 'cards': cards})
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    if 'username' not in session:
+        return jsonify({'error': 'login required'}), 401
+    return jsonify(read_stats())
+
+@app.route('/api/timers', methods=['GET'])
+def api_timers():
+    if not api_authorized():
+        return jsonify({'error': 'login required'}), 401
+    body, etag = timers_payload()
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Timers-Version'] = str(timers_revision())
+    stale = stale_state()
+    if stale:
+        response.headers['X-Timers-Stale-Since'] = _iso(stale['since'])
+    return response.make_conditional(request)
+
+# Long polling for clients that can't hold an SSE connection. A request with
+# ?since=<X-Timers-Version> returns the timers as soon as the revision differs,
+# or 204 after `timeout` seconds. A held request costs a parked thread, and on
+# stores without a change feed it rechecks the store once per cache TTL.
+LONG_POLL_MAX_SECONDS = float(os.environ.get('LONG_POLL_MAX_SECONDS', '25'))
+LONG_POLL_MAX_WAITERS = int(os.environ.get('LONG_POLL_MAX_WAITERS', '200'))
+_long_polls = {'waiting': 0}
+_long_polls_lock = threading.Lock()
+
+def timers_revision():
+    timers_snapshot()
+    ts = tenant_state()
+    with ts.lock:
+        return ts.timer_cache['revision']
+
+def wait_for_revision(since, timeout):
+    # the current revision once it differs from `since`, or None on timeout
+    deadline = time.monotonic() + timeout
+    ts = tenant_state()
+    while True:
+        revision = timers_revision()
+        remaining = deadline - time.monotonic()
+        if revision != since or remaining <= 0:
+            return revision if revision != since else None
+        with ts.revision_changed:
+            if ts.timer_cache['revision'] == since:
+                ts.revision_changed.wait(min(remaining, TIMER_CACHE_TTL))
+
+@app.route('/api/timers/wait', methods=['GET'])
+def api_timers_wait():
+    if not api_authorized():
+        return jsonify({'error': 'login required'}), 401
+    since = request.args.get('since', type=int)
+    timeout = min(max(request.args.get('timeout', LONG_POLL_MAX_SECONDS, type=float), 0), LONG_POLL_MAX_SECONDS)
+    with _long_polls_lock:
+        if since is not None and _long_polls['waiting'] >= LONG_POLL_MAX_WAITERS:
+            response = jsonify({'error': 'too many waiting clients'})
+            response.status_code = 503
+            response.headers['Retry-After'] = '5'
+            return response
+        _long_polls['waiting'] += 1
+    try:
+        revision = timers_revision() if since is None else wait_for_revision(since, timeout)
+    finally:
+        with _long_polls_lock:
+            _long_polls['waiting'] -= 1
+    if revision is None:
+        response = app.response_class(status=204)
+        response.headers['X-Timers-Version'] = str(since)
+        return response
+    body, etag = timers_payload()
+    response = app.response_class(b'{"version":%d,' % revision + body[1:], mimetype='application/json')
+    response.headers['X-Timers-Version'] = str(revision)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/events', methods=['GET'])
+def events():
+    if not api_authorized():
+        return jsonify({'error': 'login required'}), 401
+    sub = _Subscriber(current_tenant())
+    with _subscribers_lock:
+        _subscribers.add(sub)
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(_event_stream(sub)), mimetype='text/event-stream', headers=headers)
+
+# longest ?within= accepted, in minutes; no respawn timer looks that far ahead
+UPCOMING_MAX_MINUTES = 366 * 24 * 60
+
+@app.route('/api/upcoming', methods=['GET'])
+def api_upcoming():
+    if not api_authorized():
+        return jsonify({'error': 'login required'}), 401
+    within = request.args.get('within', type=float)
+    # the comparison is False for nan as well
+    if within is not None and not 0 <= within <= UPCOMING_MAX_MINUTES:
+        return jsonify({'error': f'within must be between 0 and {UPCOMING_MAX_MINUTES} minutes'}), 400
+    limit = request.args.get('limit', type=int)
+    due, upcoming = spawn_schedule(utcnow(), None if within is None else timedelta(minutes=within), limit)
+    def entries(items):
+        return [{'name': name, 'spawn_time': _iso(spawn_dt), 'window_end_time': _iso(window_end_dt)}
+                for name, spawn_dt, window_end_dt in items]
+    return jsonify({'due': entries(due), 'upcoming': entries(upcoming)})
+
+# Schedule feeds. /feeds/schedule.ics (iCalendar) and /feeds/schedule.json list
+# every boss's current spawn window, in spawn order. Each is kept per tenant as
+# prebuilt bytes with an ETag. When the snapshot moves, only bosses whose card
+# version changed are rendered again and the other entries are reused, so the
+# many calendars polling a feed cost a version check until a timer changes.
+FEED_TYPES = {'ics': 'text/calendar', 'json': 'application/json'}
+FEED_MAX_AGE = int(os.environ.get('FEED_MAX_AGE', '60'))
+
+def _ics_text(value):
+    return str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+def _ics_line(line):
+    # content lines are folded at 75 octets, never inside a UTF-8 sequence
+    data = line.encode()
+    parts = []
+    while len(data) > 75:
+        cut = 75 if not parts else 74
+        while data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(data[:cut])
+        data = data[cut:]
+    parts.append(data)
+    return b'\r\n '.join(parts) + b'\r\n'
+
+def _ics_time(dt):
+    return dt.strftime('%Y%m%dT%H%M%SZ')
+
+def _feed_entry(kind, tenant, boss, doc):
+    kill_dt, spawn_dt, window_end_dt = timer_instants(boss, doc)
+    if kind == 'json':
+        return json.dumps({
+            'name': boss['name'],
+            'spawn_time': _iso(spawn_dt),
+            'window_end_time': _iso(window_end_dt),
+            'kill_time': _iso(kill_dt),
+            'user': doc.get('user'),
+        }, separators=(',', ':')).encode()
+    lines = [
+        'BEGIN:VEVENT',
+        # one event per boss, updated in place: clients match on UID and take the highest SEQUENCE
+        f'UID:{_ics_text(boss["name"])}@{_ics_text(tenant)}.timers',
+        f'SEQUENCE:{doc.get("rev", 0)}',
+        f'DTSTAMP:{_ics_time(kill_dt)}',
+        f'DTSTART:{_ics_time(spawn_dt)}',
+        f'DTEND:{_ics_time(window_end_dt)}',
+        f'SUMMARY:{_ics_text(boss["name"])} spawn window',
+        f'DESCRIPTION:{_ics_text("Killed %s UTC by %s" % (kill_dt.strftime("%Y-%m-%d %H:%M"), doc.get("user") or "N/A"))}',
+        'TRANSP:TRANSPARENT',
+        'END:VEVENT',
+    ]
+    return b''.join(_ics_line(line) for line in lines)
+
+def _feed_body(kind, tenant, entries):
+    if kind == 'json':
+        return b'{"tenant":%s,"bosses":[%s]}' % (json.dumps(tenant).encode(), b','.join(entries))
+    header = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Axiom Timers//Spawn schedule//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_ics_text(tenant)} boss spawns',
+        'REFRESH-INTERVAL;VALUE=DURATION:PT5M',
+        'X-PUBLISHED-TTL:PT5M',
+    ]
+    return b''.join(_ics_line(line) for line in header) + b''.join(entries) + b'END:VCALENDAR\r\n'
+
+def feed_payload(kind):
+    version, timers = timers_snapshot()
+    ts = tenant_state()
+    feed = ts.feeds[kind]
+    with ts.feeds_lock:
+        if feed['version'] == version:
+            return feed['body'], feed['etag']
+        due, upcoming = spawn_schedule(utcnow(), timers=timers)
+        with ts.lock:
+            all_changed_at = ts.timer_cache['all_changed_at']
+            changed = dict(ts.card_versions)
+            timers = dict(ts.timer_cache['timers'] or timers)
+        names = [entry[0] for entry in due + upcoming if timers.get(entry[0])]
+        chunks = feed['chunks']
+        entries = []
+        for name in names:
+            chunk = chunks.get(name)
+            # an entry rendered at or after the boss's last change is still current
+            if chunk is None or chunk[0] < max(changed.get(name, 0), all_changed_at):
+                chunk = chunks[name] = (version, _feed_entry(kind, ts.tenant, get_boss_by_name(name), timers[name]))
+                inc('timers_feed_entries_rendered_total', (('feed', kind),))
+            entries.append(chunk[1])
+        for name in chunks.keys() - set(names):
+            del chunks[name]
+        body = _feed_body(kind, ts.tenant, entries)
+        feed.update(version=version, body=body, etag=hashlib.sha1(body).hexdigest())
+        return body, feed['etag']
+
+@app.route('/feeds/schedule.<kind>', methods=['GET'])
+def schedule_feed(kind):
+    # subscribe with /feeds/schedule.ics?token=<API token>
+    if kind not in FEED_TYPES:
+        abort(404)
+    if not api_authorized():
+        return jsonify({'error': 'login required'}), 401
+    body, etag = feed_payload(kind)
+    response = app.response_class(body, mimetype=FEED_TYPES[kind])
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'private, max-age={FEED_MAX_AGE}'
+    return response.make_conditional(request)
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    if not api_authorized():
+        return jsonify({'error': 'login required'}), 401
+    body = render_metrics()
+    stats = read_stats()
+    body += '# HELP timers_snapshot_reads_total Timer snapshot reads by outcome.\n# TYPE timers_snapshot_reads_total counter\n'
+    for outcome in ('cache_hits', 'fetches', 'coalesced'):
+        body += f'timers_snapshot_reads_total{{outcome="{outcome}"}} {stats[outcome]}\n'
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/kills', methods=['GET'])
+def api_kills():
+    # ?boss=<name> or ?user=<name>, optionally &days=<n>; page with &before=<next_before>,
+    # an opaque cursor of the last kill's time and id so kills sharing a time aren't skipped
+    if not api_authorized():
+        return jsonify({'error': 'login required'}), 401
+    boss_name = request.args.get('boss')
+    user = request.args.get('user')
+    if not boss_name and not user:
+        return jsonify({'error': 'boss or user is required'}), 400
+    days = request.args.get('days', type=float)
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+    now = utcnow()
+    before, _, before_id = (request.args.get('before') or '').partition('~')
+    try:
+        before = _parse_kill_time(before, now) if before else None
+    except ValueError:
+        return jsonify({'error': 'before must be a next_before cursor or an ISO 8601 instant'}), 400
+    try:
+        since = now - timedelta(days=days) if days else None
+    except (OverflowError, ValueError):
+        return jsonify({'error': 'days is out of range'}), 400
+    # make this instance's own recent kills visible before querying
+    flush_kills()
+    try:
+        kills = get_store().query_kills(name=boss_name, user=user, since=since, before=before, before_id=before_id or None, limit=limit)
+    except ValueError:
+        return jsonify({'error': 'invalid before cursor'}), 400
+    return jsonify({
+        'kills': [
+            {'name': k['name'], 'kill_time': _iso(k['kill_time']), 'user': k['user'], 'action': k['action']}
+            for k in kills
+        ],
+        'next_before': f'{_iso(kills[-1]["kill_time"])}~{kills[-1]["id"]}' if len(kills) == limit else None,
+    })
+
+@app.route('/api/spawn-stats', methods=['GET'])
+def api_spawn_stats():
+    if not api_authorized():
+        return jsonify({'error': 'login required'}), 401
+    names = [request.args['boss']] if 'boss' in request.args else [boss['name'] for boss in get_bosses()]
+    result = {}
+    for name in names:
+        summary = spawn_stats(name)
+        if summary is None:
+            continue
+        summary['likely_spawn_time'] = _iso(summary['likely_spawn_time'])
+        result[name] = summary
+    return jsonify({'bosses': result})
+
+BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', '500'))
+
+def _parse_kill_time(text, now):
+    # "now" or empty, HH:MM[:SS] for the latest such UTC time, or an ISO 8601 instant
+    text = text.strip()
+    if not text or text.lower() == 'now':
+        return now
+    if len(text) <= 8 and ':' in text and 'T' not in text:
+        parts = [int(p) for p in text.split(':')]
+        kill_dt = now.replace(hour=parts[0], minute=parts[1], second=parts[2] if len(parts) > 2 else 0, microsecond=0)
+        return kill_dt - timedelta(days=1) if kill_dt > now else kill_dt
+    kill_dt = datetime.fromisoformat(text[:-1] + '+00:00' if text.endswith('Z') else text)
+    if kill_dt.tzinfo:
+        kill_dt = (kill_dt - kill_dt.utcoffset()).replace(tzinfo=None)
+    return _bson_time(kill_dt)
+
+def _bulk_lines():
+    # JSON [{"boss": ..., "kill_time": ...}] or text lines "<boss>[,<tab>] <kill time>"
+    if request.is_json:
+        for item in request.get_json(silent=True):
+            if isinstance(item, dict):
+                yield str(item.get('boss', '')), str(item.get('kill_time') or '')
             else:
-                window_end_dt = spawn_dt + timedelta(minutes=boss['window_minutes'])
-            respawn_remaining = spawn_dt - now
-            window_remaining = window_end_dt - now
-            respawn_seconds = int(respawn_remaining.total_seconds())
-            window_seconds = int(window_remaining.total_seconds())
-        else:
-            respawn_remaining = window_remaining = None
-            respawn_seconds = window_seconds = None
-        if last_kill and respawn_remaining.total_seconds() <= 0:
-            window_end_display = format_remaining(window_remaining)
-            window_seconds_display = window_seconds
+                yield '', ''
+        return
+    for raw in request.stream:
+        line = raw.decode('utf-8', 'replace').strip()
+        if not line or line.startswith('#'):
+            continue
+        for sep in ('\t', ','):
+            if sep in line:
+                name, _, when = line.partition(sep)
+                yield name.strip(), when.strip()
+                break
         else:
-            window_end_display = ''
-            window_seconds_display = ''
-        boss_info = {
-            'name': boss['name'],
-            'respawn': format_remaining(respawn_remaining) if last_kill else 'N/A',
-            'respawn_seconds': respawn_seconds if last_kill else '',
-            'window_end': window_end_display if last_kill else 'N/A',
-            'window_seconds': window_seconds_display if last_kill else '',
-            'last_kill': last_kill_dt.strftime('%Y-%m-%d %H:%M UTC') if last_kill else 'N/A',
-            'last_user': last_user,
-        }
-        if last_kill and respawn_seconds is not None and respawn_seconds <= 0:
-            due_bosses.append(boss_info)
+            if get_boss_by_name(line):
+                yield line, ''
+            else:
+                name, _, when = line.rpartition(' ')
+                yield name.strip(), when
+
+@app.route('/api/timers/bulk', methods=['POST'])
+def api_bulk_reset():
+    if not api_authorized():
+        return jsonify({'error': 'login required'}), 401
+    if request.is_json and not isinstance(request.get_json(silent=True), list):
+        return jsonify({'error': 'expected a JSON list of {"boss": ..., "kill_time": ...} items'}), 400
+    now = utcnow()
+    results, latest = [], {}
+    for name, when in _bulk_lines():
+        if len(results) >= BULK_MAX_ITEMS:
+            return jsonify({'error': f'at most {BULK_MAX_ITEMS} items per request'}), 413
+        result = {'boss': name}
+        results.append(result)
+        boss = get_boss_by_name(name)
+        if not boss:
+            result.update(status='error', error='unknown boss')
+            continue
+        try:
+            kill_dt = _parse_kill_time(when, now)
+        except ValueError:
+            result.update(status='error', error='invalid kill time')
+            continue
+        if kill_dt > now:
+            result.update(status='error', error='kill time is in the future')
+            continue
+        result['kill_time'] = kill_dt
+        # a boss listed twice keeps its latest kill
+        previous = latest.get(name)
+        if previous is not None and results[previous]['kill_time'] >= kill_dt:
+            result.update(status='superseded')
+            continue
+        if previous is not None:
+            results[previous]['status'] = 'superseded'
+        latest[name] = len(results) - 1
+    indexes = sorted(latest.values())
+    with timed_phase('store'):
+        outcomes = bulk_reset_timers(
+            [(get_boss_by_name(results[i]['boss']), results[i]['kill_time']) for i in indexes],
+            session.get('username', 'api'),
+        )
+    for i, (status, doc) in zip(indexes, outcomes):
+        if status == 'error':
+            results[i].update(status='error', error='write failed')
+        elif status == 'stale':
+            results[i].update(status='stale', error=STALE_WRITE, current_kill_time=_iso(doc['kill_time']) if doc else None)
         else:
-            not_due_bosses.append(boss_info)
-    not_due_bosses.sort(key=lambda b: b['respawn_seconds'] if isinstance(b['respawn_seconds'], int) and b['respawn_seconds'] > 0 else float('inf'))
-    username = session.get('username')
-    return render_template_string(TEMPLATE, bosses=not_due_bosses, due_bosses=due_bosses, username=username, now=datetime.utcnow)
+            results[i].update(status=status, spawn_time=_iso(doc['spawn_time']), window_end_time=_iso(doc['window_end_time']))
+    for result in results:
+        if 'kill_time' in result:
+            result['kill_time'] = _iso(result['kill_time'])
+    return jsonify({
+        'applied': sum(1 for r in results if r['status'] in ('ok', 'queued')),
+        'results': results,
+    })
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
         username = request.form.get('username')
         password = request.form.get('password')
-        if USERS.get(username) == password:
+        tenant = request.form.get('tenant') or DEFAULT_TENANT
+        if tenant in _tenant_configs and tenant_users(tenant).get(username) == password:
             session['username'] = username
+            session['tenant'] = tenant
             flash('Logged in successfully.', 'success')
             return redirect(url_for('index'))
         else:
             flash('Invalid username or password.', 'danger')
-    return render_template_string(LOGIN_TEMPLATE, now=datetime.utcnow)
+    return render_template('login.html', now=datetime.utcnow, tenants=sorted(_tenant_configs), default_tenant=DEFAULT_TENANT)
 
 @app.route('/logout')
 def logout():
     session.pop('username', None)
+    session.pop('tenant', None)
     flash('Logged out.', 'success')
     return redirect(url_for('index'))
 
@@ -196,20 +2750,15 @@ def reset(boss_name):
         flash('Boss not found.', 'danger')
         return redirect(url_for('index'))
     if request.method == 'POST':
-        kill_dt = datetime.utcnow()
-        spawn_dt = kill_dt + timedelta(minutes=boss['respawn_minutes'])
-        window_end_dt = spawn_dt + timedelta(minutes=boss['window_minutes'])
-        timer_data = {
-            "name": boss_name,
-            "kill_time": kill_dt.isoformat(),
-            "spawn_time": spawn_dt.isoformat(),
-            "window_end_time": window_end_dt.isoformat(),
-            "user": session['username']
-        }
-        save_timer(boss_name, timer_data)
-        flash(f'{boss_name} timer reset!', 'success')
+        reset_id = request.form.get('idempotency_key') or request.headers.get('Idempotency-Key')
+        with timed_phase('store'):
+            timer, created = reset_timer(boss, session['username'], reset_id)
+        if created:
+            flash(f'{boss_name} timer reset! Next spawn at {timer["spawn_time"]:%H:%M} UTC.', 'success')
+        else:
+            flash(f'{boss_name} was already reset by {timer.get("user")} at {timer["kill_time"]:%H:%M:%S} UTC.', 'success')
         return redirect(url_for('index'))
-    return render_template_string(RESET_TEMPLATE, boss=boss, now_func=datetime.utcnow)
+    return render_template('reset.html', boss=boss, now_func=datetime.utcnow, idempotency_key=uuid.uuid4().hex)
 
 @app.route('/edit/<boss_name>', methods=['GET', 'POST'])
 def edit(boss_name):
@@ -220,9 +2769,7 @@ def edit(boss_name):
     if not boss:
         flash('Boss not found.', 'danger')
         return redirect(url_for('index'))
-    timers = load_timers()
-    timer_entry = timers.get(boss_name)
-    if not timer_entry:
+    if request.method == 'GET' and boss_name not in load_timers():
         flash('No timer to edit for this boss.', 'danger')
         return redirect(url_for('index'))
     if request.method == 'POST':
@@ -234,16 +2781,22 @@ def edit(boss_name):
         except Exception:
             flash('Invalid input.', 'danger')
             return redirect(url_for('edit', boss_name=boss_name))
+        if stale_state():
+            flash('The timer store is unavailable, so timers cannot be edited right now. Please try again shortly.', 'danger')
+            return redirect(url_for('index'))
         # Reduce kill_time, spawn_time, window_end_time by minutes
-        for key in ['kill_time', 'spawn_time', 'window_end_time']:
-            if timer_entry.get(key):
-                dt = datetime.fromisoformat(timer_entry[key])
-                dt -= timedelta(minutes=minutes)
-                timer_entry[key] = dt.isoformat()
-        save_timer(boss_name, timer_entry)
+        try:
+            with timed_phase('store'):
+                timer = shift_timer(boss_name, minutes)
+        except (PyMongoError, sqlite3.Error):
+            flash('The timer store is unavailable, so timers cannot be edited right now. Please try again shortly.', 'danger')
+            return redirect(url_for('index'))
+        if not timer:
+            flash('No timer to edit for this boss.', 'danger')
+            return redirect(url_for('index'))
         flash(f'{boss_name} timer reduced by {minutes} minutes!', 'success')
         return redirect(url_for('index'))
-    return render_template_string(EDIT_TEMPLATE, boss=boss, boss_name=boss_name)
+    return render_template('edit.html', boss=boss, boss_name=boss_name)
 
 TEMPLATE = '''
 <!DOCTYPE html>
@@ -253,258 +2806,7 @@ TEMPLATE = '''
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Axiom Timers</title>
     <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;700&display=swap" rel="stylesheet">
-    <style>
-        body {
-            font-family: 'Montserrat', Arial, sans-serif;
-            background: #181a20;
-            color: #e0e6ed;
-            margin: 0;
-            padding: 0;
-            min-height: 100vh;
-            display: flex;
-            flex-direction: column;
-        }
-        .container {
-            max-width: 95vw;
-            width: 100%;
-            margin: 4vh auto 2vh auto;
-            background: #23262f;
-            padding: 4vw 2vw 3vw 2vw;
-            border-radius: 1.2rem;
-            box-shadow: 0 0.4rem 2.4rem #000a, 0 0.15rem 0.4rem #0004;
-        }
-        h1 {
-            text-align: center;
-            font-weight: 700;
-            letter-spacing: 0.12em;
-            margin-bottom: 1em;
-            font-size: 2.2rem;
-        }
-        .topbar {
-            display: flex;
-            justify-content: flex-end;
-            align-items: center;
-            margin-bottom: 2vh;
-            gap: 1vw;
-        }
-        .username {
-            margin-right: 1vw;
-            font-weight: 600;
-            color: #7dd3fc;
-            font-size: 1.1rem;
-        }
-        .boss-section {
-            margin-bottom: 2.5em;
-        }
-        .boss-cards {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(270px, 1fr));
-            gap: 1.2em;
-            margin-top: 1.2em;
-        }
-        .boss-card {
-            background: #232b3a;
-            border-radius: 1em;
-            box-shadow: 0 0.2em 1em #0003;
-            padding: 1.2em 1em 1em 1em;
-            display: flex;
-            flex-direction: column;
-            align-items: flex-start;
-            position: relative;
-            min-width: 0;
-        }
-        .boss-header {
-            display: flex;
-            align-items: center;
-            width: 100%;
-            margin-bottom: 0.7em;
-        }
-        .boss-name {
-            font-size: 1.25rem;
-            font-weight: 700;
-            flex: 1;
-            color: #7dd3fc;
-            word-break: break-word;
-        }
-        .boss-status {
-            font-size: 0.95em;
-            font-weight: 600;
-            padding: 0.25em 0.8em;
-            border-radius: 1em;
-            background: #22c55e33;
-            color: #22c55e;
-            margin-left: 0.5em;
-        }
-        .boss-status.upcoming {
-            background: #2563eb33;
-            color: #3b82f6;
-        }
-        .boss-info {
-            margin-bottom: 0.5em;
-            width: 100%;
-        }
-        .boss-label {
-            font-weight: 600;
-            color: #94a3b8;
-            font-size: 0.98em;
-            margin-right: 0.3em;
-        }
-        .boss-value {
-            font-size: 1em;
-            color: #e0e6ed;
-        }
-        .boss-action {
-            width: 100%;
-            margin-top: 0.7em;
-            display: flex;
-            justify-content: flex-end;
-        }
-        .boss-action a.button, .boss-action button {
-            background: linear-gradient(90deg, #ff512f 0%, #dd2476 100%);
-            color: #fff;
-            padding: 0.7em 1.3em;
-            border-radius: 0.5em;
-            text-decoration: none;
-            font-weight: 700;
-            border: none;
-            cursor: pointer;
-            box-shadow: 0 0.2em 0.8em #dd247655, 0 0.1em 0.3em #0002;
-            transition: background 0.18s, box-shadow 0.18s, transform 0.12s;
-            outline: none;
-            display: inline-block;
-            margin: 0.3em 0;
-            font-size: 1.1rem;
-            letter-spacing: 0.03em;
-            position: relative;
-            overflow: hidden;
-        }
-        .boss-action a.button:hover, .boss-action button:hover, .boss-action a.button:focus, .boss-action button:focus {
-            background: linear-gradient(90deg, #ff512f 0%, #f09819 100%);
-            box-shadow: 0 0.4em 1.6em #ff512f55, 0 0.1em 0.3em #0003;
-            transform: translateY(-2px) scale(1.03);
-        }
-        .boss-action a.button:active, .boss-action button:active {
-            background: linear-gradient(90deg, #dd2476 0%, #ff512f 100%);
-            box-shadow: 0 0.1em 0.3em #ff512f33;
-            transform: scale(0.98);
-        }
-        .flash {
-            padding: 1em;
-            margin-bottom: 1.2em;
-            border-radius: 0.5em;
-            font-weight: 600;
-            letter-spacing: 0.03em;
-            font-size: 1rem;
-        }
-        .flash-success {
-            background: #22c55e33;
-            color: #22c55e;
-        }
-        .flash-danger {
-            background: #ef444433;
-            color: #ef4444;
-        }
-        /* Responsive styles */
-        @media (max-width: 600px) {
-            .container {
-                padding: 2vw 1vw 2vw 1vw;
-            }
-            h1 {
-                font-size: 1.4rem;
-            }
-            .topbar {
-                flex-direction: column;
-                align-items: stretch;
-                gap: 1vw;
-                margin-bottom: 1em;
-            }
-            .username {
-                margin-right: 0;
-                margin-bottom: 0.2em;
-                text-align: left;
-                font-size: 1rem;
-            }
-            .boss-cards {
-                grid-template-columns: 1fr;
-                gap: 1em;
-            }
-            .boss-card {
-                padding: 1em 0.7em 0.8em 0.7em;
-            }
-            .boss-name {
-                font-size: 1.1rem;
-            }
-            th, td {
-                padding: 0.7em 0.2em;
-                font-size: 0.98rem;
-            }
-            table, thead, tbody, th, td, tr {
-                display: block;
-            }
-            table {
-                width: 100%;
-                overflow-x: hidden;
-                background: none;
-            }
-            thead {
-                display: none;
-            }
-            tr {
-                margin-bottom: 1em;
-                box-shadow: 0 0.1em 0.4em #0002;
-                border-radius: 0.7em;
-                background: #23262f;
-                display: block;
-                padding: 0.4em 0.1em;
-            }
-            td {
-                border: none;
-                position: relative;
-                padding-left: 44%;
-                text-align: left;
-                min-height: 2em;
-                display: flex;
-                align-items: center;
-                font-size: 0.98rem;
-                margin-bottom: 0.15em;
-                background: none;
-            }
-            td:before {
-                position: absolute;
-                left: 0.6em;
-                width: 40%;
-                white-space: nowrap;
-                font-weight: 700;
-                color: #7dd3fc;
-                content: attr(data-label);
-                font-size: 0.98rem;
-            }
-            td:last-child {
-                justify-content: flex-start;
-            }
-            a.button, button {
-                width: 100%;
-                margin: 0.2em 0;
-                font-size: 1rem;
-                padding: 0.7em 0.4em;
-            }
-        }
-        @media (max-width: 400px) {
-            h1 {
-                font-size: 1.1rem;
-            }
-            .container {
-                padding: 1vw 0.5vw 1vw 0.5vw;
-            }
-        }
-        footer {
-            text-align: center;
-            color: #64748b;
-            font-size: 0.95rem;
-            margin-top: 2em;
-            margin-bottom: 1em;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('dashboard.css') }}">
 </head>
 <body>
     <div class="container">
@@ -524,117 +2826,52 @@ TEMPLATE = '''
             {% endfor %}
           {% endif %}
         {% endwith %}
-        {% if due_bosses %}
-        <div class="boss-section">
+        {% if stale %}
+        <div class="flash flash-danger">Database unavailable since {{ stale.since.strftime('%H:%M:%S') }} UTC. Showing timers {% if stale.as_of %}saved at {{ stale.as_of.strftime('%H:%M:%S') }} UTC{% else %}from the last successful load{% endif %}{% if stale.pending %}; {{ stale.pending }} reset{{ 's' if stale.pending != 1 }} queued{% endif %}.</div>
+        {% endif %}
+        <div class="boss-section" id="due-section"{% if not due_bosses %} style="display:none"{% endif %}>
             <h2 style="color:#22c55e; text-align:center; margin-top:1em;">Due Bosses</h2>
-            <div class="boss-cards">
-                {% for boss in due_bosses %}
-                <div class="boss-card">
-                    <div class="boss-header">
-                        <span class="boss-name">{{ boss.name }}</span>
-                        <span class="boss-status">Due</span>
-                    </div>
-                    <div class="boss-info"><span class="boss-label">Last Reset By:</span> <span class="boss-value">{{ boss.last_user }}</span></div>
-                    <div class="boss-info"><span class="boss-label">Next Spawn:</span> <span class="boss-value"><span class="respawn-timer" data-seconds="{{ boss.respawn_seconds }}">{{ boss.respawn }}</span></span></div>
-                    <div class="boss-info"><span class="boss-label">Window End:</span> <span class="boss-value"><span class="window-timer" data-seconds="{{ boss.window_seconds }}">{{ boss.window_end }}</span></span></div>
-                    <div class="boss-action">
-                        {% if username %}
-                            <a class="button" href="/reset/{{ boss.name }}">Reset</a>
-                            <a class="button" href="/edit/{{ boss.name }}" style="margin-left:0.5em;background:linear-gradient(90deg,#2563eb 0%,#3b82f6 100%)">Edit</a>
-                        {% else %}
-                            <a class="button" href="/login">Login to Reset</a>
-                        {% endif %}
-                    </div>
-                </div>
-                {% endfor %}
+            <div class="boss-cards" id="due-cards">
+                {% for boss in due_bosses %}{% set due = true %}{% include 'card.html' %}{% endfor %}
             </div>
         </div>
-        {% endif %}
         <div class="boss-section">
             <h2 style="color:#7dd3fc; text-align:center; margin-top:2em;">Upcoming Bosses</h2>
-            <div class="boss-cards">
-                {% for boss in bosses %}
-                <div class="boss-card">
-                    <div class="boss-header">
-                        <span class="boss-name">{{ boss.name }}</span>
-                        <span class="boss-status upcoming">Upcoming</span>
-                    </div>
-                    <div class="boss-info"><span class="boss-label">Last Reset By:</span> <span class="boss-value">{{ boss.last_user }}</span></div>
-                    <div class="boss-info"><span class="boss-label">Next Spawn:</span> <span class="boss-value"><span class="respawn-timer" data-seconds="{{ boss.respawn_seconds }}">{{ boss.respawn }}</span></span></div>
-                    <div class="boss-info"><span class="boss-label">Window End:</span> <span class="boss-value"><span class="window-timer" data-seconds="{{ boss.window_seconds }}">{{ boss.window_end }}</span></span></div>
-                    <div class="boss-action">
-                        {% if username %}
-                            <a class="button" href="/reset/{{ boss.name }}">Reset</a>
-                            <a class="button" href="/edit/{{ boss.name }}">Edit</a>
-                        {% else %}
-                            <a class="button" href="/login">Login to Reset</a>
-                        {% endif %}
-                    </div>
-                </div>
-                {% endfor %}
+            <div class="boss-cards" id="upcoming-cards">
+                {% for boss in bosses %}{% set due = false %}{% include 'card.html' %}{% endfor %}
             </div>
         </div>
     </div>
     <footer>
         &copy; {{ now().year }} Axiom Clan Timers &mdash; Powered by Flask
     </footer>
-    <script>
-    function formatCountdown(seconds) {
-        if (seconds === null || seconds === '' || isNaN(seconds)) return '';
-        if (seconds <= 0) return 'Ready!';
-        let h = Math.floor(seconds / 3600);
-        let m = Math.floor((seconds % 3600) / 60);
-        let s = seconds % 60;
-        return `${h.toString().padStart(2, '0')}:${m.toString().padStart(2, '0')}:${s.toString().padStart(2, '0')}`;
-    }
-    function updateTimers() {
-        document.querySelectorAll('.respawn-timer').forEach(function(el) {
-            let seconds = parseInt(el.getAttribute('data-seconds'));
-            if (isNaN(seconds) || el.innerText === 'N/A') return;
-            if (seconds > 0) {
-                el.innerText = formatCountdown(seconds);
-                el.setAttribute('data-seconds', seconds - 1);
-                // Hide window timer if respawn is not ready
-                let windowEl = el.parentElement.parentElement.querySelector('.window-timer');
-                if (windowEl) {
-                    windowEl.innerText = '';
-                }
-            } else {
-                el.innerText = 'Ready!';
-                // Show window timer if available
-                let windowEl = el.parentElement.parentElement.querySelector('.window-timer');
-                if (windowEl) {
-                    let wSeconds = parseInt(windowEl.getAttribute('data-seconds'));
-                    if (!isNaN(wSeconds) && wSeconds > 0) {
-                        windowEl.innerText = formatCountdown(wSeconds);
-                        windowEl.setAttribute('data-seconds', wSeconds - 1);
-                    } else if (!isNaN(wSeconds) && wSeconds <= 0) {
-                        windowEl.innerText = '';
-                    }
-                }
-            }
-        });
-        // Also update window timers that are already running
-        document.querySelectorAll('.window-timer').forEach(function(el) {
-            let respawnEl = el.parentElement.parentElement.querySelector('.respawn-timer');
-            if (respawnEl && respawnEl.innerText !== 'Ready!') return; // Only update if respawn is ready
-            let seconds = parseInt(el.getAttribute('data-seconds'));
-            if (isNaN(seconds) || seconds === '' || el.innerText === 'N/A') return;
-            if (seconds > 0) {
-                el.innerText = formatCountdown(seconds);
-                el.setAttribute('data-seconds', seconds - 1);
-            } else {
-                el.innerText = '';
-            }
-        });
-    }
-    setInterval(updateTimers, 1000);
-    window.onload = updateTimers;
-    </script>
+    <script src="{{ asset_url('dashboard.js') }}" data-server-now="{{ server_now }}"></script>
 </body>
 </html>
 '''
 
+# one boss card; the dashboard renders it in a loop and /fragment renders single cards
+CARD_TEMPLATE = '''
+<div class="boss-card" data-boss="{{ boss.name }}" data-rev="{{ boss.rev }}" data-spawn-at="{{ boss.spawn_at }}" data-window-end-at="{{ boss.window_end_at }}">
+    <div class="boss-header">
+        <span class="boss-name">{{ boss.name }}</span>
+        <span class="boss-status{% if not due %} upcoming{% endif %}">{{ 'Due' if due else 'Upcoming' }}</span>
+    </div>
+    <div class="boss-info"><span class="boss-label">Last Reset By:</span> <span class="boss-value last-user">{{ boss.last_user }}</span></div>
+    <div class="boss-info"><span class="boss-label">Next Spawn:</span> <span class="boss-value"><span class="respawn-timer">{{ boss.respawn }}</span></span></div>
+    <div class="boss-info"><span class="boss-label">Window End:</span> <span class="boss-value"><span class="window-timer">{{ boss.window_end }}</span></span></div>
+    {% if boss.likely_spawn %}<div class="boss-info"><span class="boss-label">Likely Spawn:</span> <span class="boss-value">{{ boss.likely_spawn }}</span></div>{% endif %}
+    <div class="boss-action">
+        {% if username %}
+            <a class="button" href="/reset/{{ boss.name }}">Reset</a>
+            <a class="button" href="/edit/{{ boss.name }}"{% if due %} style="margin-left:0.5em;background:linear-gradient(90deg,#2563eb 0%,#3b82f6 100%)"{% endif %}>Edit</a>
+        {% else %}
+            <a class="button" href="/login">Login to Reset</a>
+        {% endif %}
+    </div>
+</div>
+'''
+
 LOGIN_TEMPLATE = '''
 <!DOCTYPE html>
 <html lang="en">
@@ -648,7 +2885,7 @@ LOGIN_TEMPLATE = '''
         h2 { text-align: center; }
         form { display: flex; flex-direction: column; gap: 1em; }
         label { font-weight: bold; }
-        input { padding: 0.5em; border-radius: 5px; border: none; }
+        input, select { padding: 0.5em; border-radius: 5px; border: none; }
         button { background: #3b82f6; color: #fff; padding: 0.7em; border: none; border-radius: 5px; font-size: 1em; cursor: pointer; }
         button:hover { background: #2563eb; }
         a { color: #3b82f6; text-decoration: none; }
@@ -668,6 +2905,12 @@ LOGIN_TEMPLATE = '''
           {% endif %}
         {% endwith %}
         <form method="post">
+            {% if tenants|length > 1 %}
+            <label for="tenant">Clan:</label>
+            <select name="tenant" id="tenant">
+                {% for tenant in tenants %}<option value="{{ tenant }}"{% if tenant == default_tenant %} selected{% endif %}>{{ tenant }}</option>{% endfor %}
+            </select>
+            {% endif %}
             <label for="username">Username:</label>
             <input type="text" name="username" id="username" required>
             <label for="password">Password:</label>
@@ -712,6 +2955,7 @@ RESET_TEMPLATE = '''
           {% endif %}
         {% endwith %}
         <form method="post">
+            <input type="hidden" name="idempotency_key" value="{{ idempotency_key }}">
             <div style="text-align:center; font-size:1.1em; margin-bottom:1em;">Are you sure you want to reset the timer for <b>{{ boss.name }}</b>?</div>
             <button type="submit">Confirm Reset</button>
         </form>
@@ -756,4 +3000,29 @@ EDIT_TEMPLATE = '''
     </div>
 </body>
 </html>
-''' 
\ No newline at end of file
+''' 
+
+# Compile every template once at import; render_template() reuses the cached
+# Template objects instead of re-parsing the source on each request.
+app.jinja_loader = DictLoader({
+    'index.html': TEMPLATE,
+    'card.html': CARD_TEMPLATE,
+    'login.html': LOGIN_TEMPLATE,
+    'reset.html': RESET_TEMPLATE,
+    'edit.html': EDIT_TEMPLATE,
+})
+for _template_name in app.jinja_loader.list_templates():
+    app.jinja_env.get_template(_template_name)
+
+_configure_alert_sinks()
+_start_alerts()
+
+record_startup('import', _process_started)
+
+if __name__ == '__main__':
+    # python api/index.py migrate [bosses.json]
+    import sys
+    if sys.argv[1:2] != ['migrate']:
+        sys.exit('usage: index.py migrate [legacy_bosses.json]')
+    converted, imported = migrate_timers(sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f'Converted {converted} timers, imported {imported} from legacy file.')
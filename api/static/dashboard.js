@@ -0,0 +1,175 @@
+function formatCountdown(seconds) {
+    if (seconds === null || seconds === '' || isNaN(seconds)) return '';
+    if (seconds <= 0) return 'Ready!';
+    let h = Math.floor(seconds / 3600);
+    let m = Math.floor((seconds % 3600) / 60);
+    let s = seconds % 60;
+    return `${h.toString().padStart(2, '0')}:${m.toString().padStart(2, '0')}:${s.toString().padStart(2, '0')}`;
+}
+
+// Every countdown is computed from absolute epochs sent by the server, so a
+// throttled background tab shows the right time as soon as it ticks again.
+// Card elements are looked up once; only cards on screen are redrawn.
+let serverNow = parseInt(document.currentScript.getAttribute('data-server-now'));
+let clockOffset = isNaN(serverNow) ? 0 : serverNow - Date.now();
+let cards = new Map();
+let tickTimer = null;
+
+let visibility = window.IntersectionObserver ? new IntersectionObserver(function(observed) {
+    observed.forEach(function(o) {
+        let entry = cards.get(o.target.getAttribute('data-boss'));
+        if (!entry) return;
+        entry.visible = o.isIntersecting;
+        if (entry.visible) renderCard(entry, Date.now() + clockOffset);
+    });
+}) : null;
+
+function parseEpoch(value) {
+    let ms = parseInt(value);
+    return isNaN(ms) ? null : ms;
+}
+function registerCard(card) {
+    let entry = {
+        card: card,
+        respawnEl: card.querySelector('.respawn-timer'),
+        windowEl: card.querySelector('.window-timer'),
+        statusEl: card.querySelector('.boss-status'),
+        userEl: card.querySelector('.last-user'),
+        rev: parseInt(card.getAttribute('data-rev')) || 0,
+        spawnAt: parseEpoch(card.getAttribute('data-spawn-at')),
+        windowEndAt: parseEpoch(card.getAttribute('data-window-end-at')),
+        due: card.parentElement.id === 'due-cards',
+        visible: true,
+    };
+    cards.set(card.getAttribute('data-boss'), entry);
+    if (visibility) visibility.observe(card);
+}
+function setText(el, text) {
+    if (el && el.textContent !== text) el.textContent = text;
+}
+function renderCard(entry, now) {
+    if (entry.spawnAt === null) {
+        setText(entry.respawnEl, 'N/A');
+        setText(entry.windowEl, 'N/A');
+        return;
+    }
+    let respawnSeconds = Math.ceil((entry.spawnAt - now) / 1000);
+    let windowSeconds = Math.ceil((entry.windowEndAt - now) / 1000);
+    setText(entry.respawnEl, formatCountdown(respawnSeconds));
+    // the window countdown only runs once the boss is up
+    setText(entry.windowEl, respawnSeconds <= 0 && windowSeconds > 0 ? formatCountdown(windowSeconds) : '');
+}
+function moveCard(entry, due) {
+    entry.due = due;
+    entry.statusEl.classList.toggle('upcoming', !due);
+    entry.statusEl.textContent = due ? 'Due' : 'Upcoming';
+    let target = document.getElementById(due ? 'due-cards' : 'upcoming-cards');
+    if (entry.card.parentElement !== target) {
+        target.appendChild(entry.card);
+    }
+}
+function tick() {
+    let now = Date.now() + clockOffset;
+    let moved = false;
+    cards.forEach(function(entry) {
+        let due = entry.spawnAt !== null && entry.spawnAt <= now;
+        if (due !== entry.due) {
+            moveCard(entry, due);
+            moved = true;
+        }
+        if (entry.visible) renderCard(entry, now);
+    });
+    if (moved) {
+        let dueCards = document.getElementById('due-cards');
+        document.getElementById('due-section').style.display = dueCards.children.length ? '' : 'none';
+    }
+    // wake just after the next whole second instead of drifting with setInterval
+    clearTimeout(tickTimer);
+    tickTimer = setTimeout(tick, 1000 - (now % 1000) + 20);
+}
+function applyTimerDelta(timer) {
+    let entry = cards.get(timer.name);
+    if (!entry) return;
+    entry.spawnAt = timer.spawn_time ? Date.parse(timer.spawn_time) : null;
+    entry.windowEndAt = timer.window_end_time ? Date.parse(timer.window_end_time) : null;
+    setText(entry.userEl, timer.user || 'N/A');
+    entry.rev = timer.rev || 0;
+    // force a move check: a reset sends a due boss back to upcoming
+    entry.due = null;
+    tick();
+}
+
+// Send the rev of every card on the page and swap in the ones the server
+// re-rendered because their timer has moved on. Used after the tab was hidden, after the event
+// stream reconnects (it may have missed events), and as a slow poll that
+// catches anything the event stream never carried.
+function swapCard(html, due, replaceOld) {
+    let holder = document.createElement('div');
+    holder.innerHTML = html.trim();
+    let fresh = holder.firstElementChild;
+    let old = cards.get(fresh.getAttribute('data-boss'));
+    let target = document.getElementById(due ? 'due-cards' : 'upcoming-cards');
+    if (old) {
+        if (visibility) visibility.unobserve(old.card);
+        if (replaceOld && old.card.parentElement === target) {
+            old.card.replaceWith(fresh);
+        } else {
+            old.card.remove();
+            target.appendChild(fresh);
+        }
+    } else {
+        target.appendChild(fresh);
+    }
+    registerCard(fresh);
+}
+function refreshCards() {
+    let revs = {};
+    cards.forEach(function(entry, name) { revs[name] = entry.rev; });
+    fetch('/fragment', {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({revs: revs}),
+    })
+        .then(function(response) { return response.ok ? response.json() : null; })
+        .then(function(data) {
+            if (!data) return;
+            // a full update lists every card in display order; bosses missing from it
+            // left the catalog, and their cards would make every later poll full again
+            if (data.full) {
+                let listed = new Set(data.cards.map(function(card) { return card.name; }));
+                cards.forEach(function(entry, name) {
+                    if (listed.has(name)) return;
+                    if (visibility) visibility.unobserve(entry.card);
+                    entry.card.remove();
+                    cards.delete(name);
+                });
+            }
+            data.cards.forEach(function(card) { swapCard(card.html, card.due, !data.full); });
+            let dueCards = document.getElementById('due-cards');
+            document.getElementById('due-section').style.display = dueCards.children.length ? '' : 'none';
+            tick();
+        })
+        .catch(function() {});
+}
+
+document.querySelectorAll('.boss-card').forEach(registerCard);
+document.addEventListener('visibilitychange', function() {
+    if (!document.hidden) {
+        tick();
+        refreshCards();
+    }
+});
+if (window.EventSource) {
+    let source = new EventSource('/events');
+    source.addEventListener('timer', function(e) {
+        applyTimerDelta(JSON.parse(e.data));
+    });
+    let connected = false;
+    source.addEventListener('open', function() {
+        if (connected) refreshCards();
+        connected = true;
+    });
+}
+setInterval(refreshCards, 30000);
+tick();
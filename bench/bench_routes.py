@@ -0,0 +1,247 @@
+"""Load and render benchmarks for the timer routes.
+
+Runs the Flask app in-process against the in-memory timer store, so no MongoDB
+is needed. For every roster size it seeds synthetic bosses and timers, replays
+mixed dashboard/reset/edit traffic from a pool of threads, and measures
+per-route allocations in a separate single-threaded pass.
+
+    python bench/bench_routes.py --sizes 10,100,1000 --concurrency 8 --output bench.json
+    python bench/bench_routes.py --compare bench.json        # flag p95 regressions
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUTES = ('index', 'reset', 'edit')
+
+
+def load_app():
+    os.environ['TIMER_STORE'] = 'memory'
+    os.environ.setdefault('SECRET_KEY', 'bench')
+    # every benchmarked reset must reach the store, not the duplicate-kill shortcut
+    os.environ['RESET_DEDUPE_SECONDS'] = '0'
+    spec = importlib.util.spec_from_file_location('timers_app', os.path.join(ROOT, 'api', 'index.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed(app_module, size, rng, catalog_dir):
+    roster = [
+        {'name': f'boss-{i:05d}', 'respawn_minutes': rng.choice((80, 90, 125, 135, 960, 1680, 5760)),
+         'window_minutes': rng.choice((5, 15, 960, 1440))}
+        for i in range(size)
+    ]
+    path = os.path.join(catalog_dir, f'catalog-{size}.json')
+    with open(path, 'w') as f:
+        json.dump(roster, f)
+    app_module.BOSS_CATALOG = path
+    app_module.reload_catalog()
+    store = app_module.MemoryTimerStore()
+    now = app_module.utcnow()
+    docs = []
+    for boss in roster:
+        # leave a few bosses untouched, the rest spread between due and upcoming
+        if rng.random() < 0.1:
+            continue
+        kill_dt = now - timedelta(minutes=rng.uniform(0, boss['respawn_minutes'] * 1.5))
+        spawn_dt = kill_dt + timedelta(minutes=boss['respawn_minutes'])
+        docs.append({
+            'name': boss['name'],
+            'kill_time': kill_dt,
+            'spawn_time': spawn_dt,
+            'window_end_time': spawn_dt + timedelta(minutes=boss['window_minutes']),
+            'user': 'bench',
+        })
+    store.save_many(docs)
+    app_module.set_store(store)
+    return [boss['name'] for boss in roster]
+
+
+def make_client(app_module):
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess['username'] = 'bench'
+    return client
+
+
+def issue(client, route, names, rng):
+    if route == 'index':
+        response = client.get('/')
+    elif route == 'reset':
+        response = client.post(f'/reset/{rng.choice(names)}')
+    else:
+        response = client.post(f'/edit/{rng.choice(names)}', data={'minutes': '1'})
+    response.close()
+    return response.status_code
+
+
+def pick_route(rng, mix):
+    r = rng.random()
+    if r < mix['index']:
+        return 'index'
+    if r < mix['index'] + mix['reset']:
+        return 'reset'
+    return 'edit'
+
+
+def run_load(app_module, names, requests, concurrency, mix, seed_value):
+    latencies = {route: [] for route in ROUTES}
+    errors = {route: 0 for route in ROUTES}
+    lock = threading.Lock()
+    per_worker = requests // concurrency
+
+    def worker(worker_id):
+        rng = random.Random(seed_value + worker_id)
+        client = make_client(app_module)
+        local = {route: [] for route in ROUTES}
+        local_errors = {route: 0 for route in ROUTES}
+        for _ in range(per_worker):
+            route = pick_route(rng, mix)
+            started = time.perf_counter()
+            status = issue(client, route, names, rng)
+            local[route].append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                local_errors[route] += 1
+        with lock:
+            for route in ROUTES:
+                latencies[route].extend(local[route])
+                errors[route] += local_errors[route]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return round(ordered[index], 3)
+
+
+def measure_allocations(app_module, names, samples, seed_value):
+    rng = random.Random(seed_value)
+    client = make_client(app_module)
+    results = {}
+    for route in ROUTES:
+        issue(client, route, names, rng)  # warm caches and template compilation
+        peaks, totals = [], []
+        tracemalloc.start()
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            issue(client, route, names, rng)
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            totals.append(after - before)
+        tracemalloc.stop()
+        results[route] = {
+            'peak_bytes_per_request': int(sum(peaks) / len(peaks)),
+            'retained_bytes_per_request': int(sum(totals) / len(totals)),
+        }
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path, threshold):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r['size'], r['route']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = previous.get((result['size'], result['route']))
+        if not before or not before['p95_ms'] or result['p95_ms'] is None:
+            continue
+        change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms']
+        if change > threshold:
+            regressions.append(f"{result['route']} @ {result['size']} bosses: p95 {before['p95_ms']}ms -> {result['p95_ms']}ms (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,1000,10000', help='comma separated roster sizes')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per roster size')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--mix', default='90,7,3', help='index,reset,edit percentages')
+    parser.add_argument('--alloc-samples', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write results as JSON to this path')
+    parser.add_argument('--compare', help='baseline JSON to compare p95 latencies against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed p95 slowdown before flagging')
+    args = parser.parse_args(argv)
+
+    weights = [float(x) for x in args.mix.split(',')]
+    mix = dict(zip(ROUTES, (w / sum(weights) for w in weights)))
+    app_module = load_app()
+    app_module.logging.getLogger().setLevel('WARNING')
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'mix': mix,
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory() as catalog_dir:
+        for size in (int(x) for x in args.sizes.split(',')):
+            rng = random.Random(args.seed)
+            names = seed(app_module, size, rng, catalog_dir)
+            latencies, errors, elapsed = run_load(app_module, names, args.requests, args.concurrency, mix, args.seed)
+            allocations = measure_allocations(app_module, names, args.alloc_samples, args.seed)
+            total = sum(len(v) for v in latencies.values())
+            for route in ROUTES:
+                values = latencies[route]
+                result = {
+                    'size': size,
+                    'route': route,
+                    'count': len(values),
+                    'errors': errors[route],
+                    'p50_ms': percentile(values, 50),
+                    'p95_ms': percentile(values, 95),
+                    'p99_ms': percentile(values, 99),
+                    'throughput_rps': round(len(values) / elapsed, 1),
+                    **allocations[route],
+                }
+                report['results'].append(result)
+                print(f"{size:>6} {route:<6} n={result['count']:<5} p50={result['p50_ms']}ms "
+                      f"p95={result['p95_ms']}ms p99={result['p99_ms']}ms "
+                      f"rps={result['throughput_rps']} peak={result['peak_bytes_per_request']}B")
+            print(f'{size:>6} total  {total / elapsed:.1f} req/s')
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        regressions = compare(report, args.compare, args.threshold)
+        for line in regressions:
+            print('REGRESSION', line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import importlib.util
+import json
+import os
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    # the app is a single module under api/, loaded the same way the benchmark does
+    os.environ['TIMER_STORE'] = 'memory'
+    os.environ['TIMER_CACHE_WATCH'] = '0'
+    os.environ['RESET_DEDUPE_SECONDS'] = '0'
+    # tests flush kill history themselves instead of racing the background writer
+    os.environ['KILL_FLUSH_SECONDS'] = '3600'
+    os.environ.setdefault('SECRET_KEY', 'test')
+    os.environ['SNAPSHOT_PATH'] = os.path.join(tempfile.mkdtemp(), 'timers-snapshot.json')
+    spec = importlib.util.spec_from_file_location('timers_app', os.path.join(ROOT, 'api', 'index.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def client(app_module):
+    # kills buffered by an earlier test belong to that test's store
+    app_module.flush_kills()
+    app_module.set_store(app_module.MemoryTimerStore())
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess['username'] = 'tester'
+    return client
+
+
+@pytest.fixture
+def catalog(app_module, tmp_path):
+    # write(bosses) swaps in a hot-reloaded catalog; the built-in list is back afterwards
+    path = tmp_path / 'bosses.json'
+    stamp = [0]
+
+    def write(bosses):
+        path.write_text(json.dumps(bosses))
+        stamp[0] += 1
+        os.utime(path, ns=(stamp[0] * 10 ** 9, stamp[0] * 10 ** 9))
+        app_module.reload_catalog()
+
+    app_module.BOSS_CATALOG = str(path)
+    yield write
+    app_module.BOSS_CATALOG = ''
+    app_module.reload_catalog()
@@ -0,0 +1,14 @@
+def test_refresh_schedules_resets_made_elsewhere(app_module, client, tmp_path):
+    store = app_module.SQLiteTimerStore(str(tmp_path / 'timers.db'))
+    app_module.set_store(store)
+    app_module._alert_sinks['queue'] = app_module.QueueAlertSink()
+    try:
+        app_module.load_timers()
+        store.reset(app_module.get_boss_by_name('170'), 'elsewhere')
+        # the snapshot has outlived its TTL by the time the loop refreshes it
+        app_module.tenant_state().timer_cache['loaded_at'] -= app_module.TIMER_CACHE_TTL
+        app_module._refresh_alert_timers()
+        key = (app_module.current_tenant(), '170')
+        assert app_module._alerts['scheduled'][key][0] == store.load_all()['170']['spawn_time']
+    finally:
+        del app_module._alert_sinks['queue']
@@ -0,0 +1,56 @@
+import threading
+import time
+
+
+def test_an_unchanged_snapshot_answers_304(app_module, client):
+    first = client.get('/api/timers')
+    assert first.status_code == 200 and first.headers['ETag']
+    again = client.get('/api/timers', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304 and again.data == b''
+
+
+def test_a_reset_changes_the_etag(app_module, client):
+    etag = client.get('/api/timers').headers['ETag']
+    client.post('/reset/170')
+    after = client.get('/api/timers', headers={'If-None-Match': etag})
+    assert after.status_code == 200 and after.headers['ETag'] != etag
+    boss = next(b for b in after.get_json()['bosses'] if b['name'] == '170')
+    assert boss['user'] == 'tester'
+
+
+def test_the_body_is_built_once_per_snapshot_version(app_module, client):
+    client.get('/api/timers')
+    body = app_module.tenant_state().api_timers_cache['body']
+    client.get('/api/timers')
+    assert app_module.tenant_state().api_timers_cache['body'] is body
+
+
+def test_timers_need_a_login_or_token(app_module):
+    assert app_module.app.test_client().get('/api/timers').status_code == 401
+
+
+def test_a_long_poll_times_out_with_204(app_module, client):
+    version = client.get('/api/timers').headers['X-Timers-Version']
+    response = client.get(f'/api/timers/wait?since={version}&timeout=0.1')
+    assert response.status_code == 204 and response.headers['X-Timers-Version'] == version
+
+
+def test_a_reset_wakes_a_waiting_long_poll(app_module, client, monkeypatch):
+    # far longer than the test may take, so only the wakeup can answer in time
+    monkeypatch.setattr(app_module, 'TIMER_CACHE_TTL', 30)
+    version = int(client.get('/api/timers').headers['X-Timers-Version'])
+    result = {}
+
+    def wait():
+        started = time.monotonic()
+        result['response'] = client.get(f'/api/timers/wait?since={version}&timeout=20')
+        result['elapsed'] = time.monotonic() - started
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.2)
+    app_module.reset_timer(app_module.get_boss_by_name('170'), 'elsewhere')
+    waiter.join(5)
+    response = result['response']
+    assert response.status_code == 200 and result['elapsed'] < 2
+    assert response.get_json()['version'] == int(response.headers['X-Timers-Version']) > version
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+NOW = datetime(2026, 3, 10, 12, 30, 15, 123456)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('', NOW),
+    ('now', NOW),
+    (' NOW ', NOW),
+    ('12:00', datetime(2026, 3, 10, 12, 0)),
+    ('11:59:30', datetime(2026, 3, 10, 11, 59, 30)),
+    ('13:00', datetime(2026, 3, 9, 13, 0)),
+    ('2026-03-10T08:15:00Z', datetime(2026, 3, 10, 8, 15)),
+    ('2026-03-10T10:15:00+02:00', datetime(2026, 3, 10, 8, 15)),
+    ('2026-03-10T08:15:00.123456', datetime(2026, 3, 10, 8, 15, 0, 123000)),
+])
+def test_parse_kill_time(app_module, text, expected):
+    assert app_module._parse_kill_time(text, NOW) == expected
+
+
+@pytest.mark.parametrize('text', ['yesterday', '25:00', '2026-13-01T00:00:00'])
+def test_parse_kill_time_rejects_garbage(app_module, text):
+    with pytest.raises(ValueError):
+        app_module._parse_kill_time(text, NOW)
+
+
+def test_bulk_lines_from_text(app_module):
+    body = '# pasted from discord\n170, 12:00\n210\t2026-03-10T08:15:00Z\nCrom\n\n180 11:45\n'
+    with app_module.app.test_request_context(method='POST', data=body, content_type='text/plain'):
+        assert list(app_module._bulk_lines()) == [
+            ('170', '12:00'), ('210', '2026-03-10T08:15:00Z'), ('Crom', ''), ('180', '11:45'),
+        ]
+
+
+def test_bulk_lines_from_json(app_module):
+    items = [{'boss': '170', 'kill_time': '12:00'}, {'boss': 'Crom'}, 'junk']
+    with app_module.app.test_request_context(method='POST', json=items):
+        assert list(app_module._bulk_lines()) == [('170', '12:00'), ('Crom', ''), ('', '')]
+
+
+def test_bulk_rejects_a_json_body_that_is_not_a_list(client):
+    assert client.post('/api/timers/bulk', json=5).status_code == 400
+    assert client.post('/api/timers/bulk', json={'boss': '170'}).status_code == 400
+
+
+def test_bulk_keeps_a_newer_timer(app_module, client):
+    client.post('/reset/170')
+    older = (app_module.utcnow() - timedelta(hours=1)).isoformat() + 'Z'
+    response = client.post('/api/timers/bulk', json=[
+        {'boss': '170', 'kill_time': older}, {'boss': '210', 'kill_time': older},
+    ]).get_json()
+    assert [r['status'] for r in response['results']] == ['stale', 'ok']
+    assert response['applied'] == 1
+    timers = app_module.load_timers()
+    assert timers['170']['kill_time'] > timers['210']['kill_time']
+
+
+def test_bulk_loses_to_a_newer_kill_its_snapshot_has_not_seen(app_module, client):
+    app_module.load_timers()
+    # a reset that reached the store without passing through this snapshot
+    store = app_module.get_store()
+    newer, _ = store.reset(app_module.get_boss_by_name('170'), 'elsewhere')
+    older = (newer['kill_time'] - timedelta(minutes=5)).isoformat() + 'Z'
+    response = client.post('/api/timers/bulk', json=[{'boss': '170', 'kill_time': older}]).get_json()
+    assert [r['status'] for r in response['results']] == ['stale']
+    assert response['applied'] == 0
+    assert store.load_all()['170']['user'] == 'elsewhere'
+    assert app_module.load_timers()['170']['user'] == 'elsewhere'
+
+
+def test_replay_skips_a_queued_reset_the_store_has_superseded(app_module, client):
+    boss = app_module.get_boss_by_name('170')
+    app_module.load_timers()
+    ts = app_module.tenant_state()
+    queued = app_module._reset_doc(boss, 'queued', app_module.utcnow() - timedelta(minutes=5), 'q1')
+    ts.degraded['pending'].append(queued)
+    app_module.get_store().reset(boss, 'elsewhere')
+    app_module._replay_pending()
+    assert ts.degraded['pending'] == []
+    assert app_module.get_store().load_all()['170']['user'] == 'elsewhere'
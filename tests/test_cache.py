@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.fixture
+def shared(app_module, client, tmp_path):
+    store = app_module.SQLiteTimerStore(str(tmp_path / 'timers.db'))
+    app_module.set_store(store)
+    app_module.load_timers()
+    return store
+
+
+def test_a_watched_snapshot_is_trusted_past_the_ttl(app_module, shared, monkeypatch):
+    monkeypatch.setitem(app_module._watch, 'active', True)
+    monkeypatch.setattr(app_module, 'TIMER_CACHE_TTL', 0)
+    shared.reset(app_module.get_boss_by_name('170'), 'elsewhere')
+    assert '170' not in app_module.load_timers()
+
+
+def test_a_watched_snapshot_is_reloaded_after_the_max_age(app_module, shared, monkeypatch):
+    # a frozen process can miss change events without the stream ever failing
+    monkeypatch.setitem(app_module._watch, 'active', True)
+    shared.reset(app_module.get_boss_by_name('170'), 'elsewhere')
+    monkeypatch.setattr(app_module, 'TIMER_CACHE_MAX_AGE', 0)
+    assert app_module.load_timers()['170']['user'] == 'elsewhere'
+
+
+def test_an_unwatched_snapshot_expires_after_the_ttl(app_module, shared, monkeypatch):
+    monkeypatch.setattr(app_module, 'TIMER_CACHE_TTL', 0)
+    shared.reset(app_module.get_boss_by_name('170'), 'elsewhere')
+    assert app_module.load_timers()['170']['user'] == 'elsewhere'
@@ -0,0 +1,58 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def flaky(app_module, client):
+    class FlakyStore(app_module.MemoryTimerStore):
+        down = False
+
+        def reset(self, *args, **kwargs):
+            if self.down:
+                raise sqlite3.OperationalError('database is locked')
+            return super().reset(*args, **kwargs)
+
+    store = FlakyStore()
+    app_module.set_store(store)
+    app_module.load_timers()
+    yield store
+    # leave the tenant healthy with nothing queued for the next test
+    store.down = False
+    app_module.invalidate_timers()
+    app_module.load_timers()
+
+
+def recover(app_module, store):
+    store.down = False
+    app_module.invalidate_timers()
+    app_module.load_timers()
+
+
+def test_a_reset_during_an_outage_is_queued_and_replayed(app_module, client, flaky):
+    flaky.down = True
+    page = client.post('/reset/170', follow_redirects=True)
+    assert b'Database unavailable' in page.data and b'1 reset queued' in page.data
+    assert app_module.load_timers()['170']['user'] == 'tester'
+    assert '170' not in flaky.load_all()
+    recover(app_module, flaky)
+    assert app_module.stale_state() is None
+    assert flaky.load_all()['170']['user'] == 'tester'
+    kills = client.get('/api/kills?boss=170').get_json()['kills']
+    assert [kill['user'] for kill in kills] == ['tester']
+
+
+def test_a_kill_recorded_elsewhere_during_the_outage_wins(app_module, client, flaky, monkeypatch):
+    boss = app_module.get_boss_by_name('170')
+    flaky.down = True
+    client.post('/reset/170')
+    flaky.down = False
+    flaky.reset(boss, 'elsewhere')
+    # the other kill lands between the reload and the replay, so only the store can tell
+    monkeypatch.setattr(flaky, 'load_all', lambda: {})
+    recover(app_module, flaky)
+    monkeypatch.undo()
+    assert app_module.stale_state() is None
+    assert app_module.tenant_state().degraded['pending'] == []
+    assert flaky.load_all()['170']['user'] == 'elsewhere'
+    assert client.get('/api/kills?boss=170').get_json()['kills'] == []
@@ -0,0 +1,36 @@
+def rendered(app_module, kind):
+    return app_module._counters.get(('timers_feed_entries_rendered_total', (('feed', kind),)), 0)
+
+
+def test_only_the_changed_boss_is_rendered_again(app_module, client):
+    for name in ('170', '210', '215'):
+        client.post(f'/reset/{name}')
+    start = rendered(app_module, 'json')
+    first = client.get('/feeds/schedule.json').get_json()
+    assert sorted(entry['name'] for entry in first['bosses']) == ['170', '210', '215']
+    assert rendered(app_module, 'json') - start == 3
+    client.post('/reset/210')
+    second = client.get('/feeds/schedule.json').get_json()
+    assert rendered(app_module, 'json') - start == 4
+    kill_times = [{entry['name']: entry['kill_time'] for entry in feed['bosses']} for feed in (first, second)]
+    assert [name for name in kill_times[0] if kill_times[0][name] != kill_times[1][name]] == ['210']
+
+
+def test_an_unchanged_feed_is_served_without_rendering(app_module, client):
+    client.post('/reset/170')
+    first = client.get('/feeds/schedule.ics')
+    start = rendered(app_module, 'ics')
+    again = client.get('/feeds/schedule.ics', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert rendered(app_module, 'ics') == start
+    assert b'UID:170@' in first.data and b'SEQUENCE:1' in first.data
+
+
+def test_a_reload_of_every_timer_renders_every_entry_again(app_module, client):
+    for name in ('170', '210'):
+        client.post(f'/reset/{name}')
+    client.get('/feeds/schedule.json')
+    start = rendered(app_module, 'json')
+    app_module.invalidate_timers()
+    client.get('/feeds/schedule.json')
+    assert rendered(app_module, 'json') - start == 2
@@ -0,0 +1,39 @@
+import re
+
+
+def page_revs(client):
+    html = client.get('/').get_data(as_text=True)
+    return {name: int(rev) for name, rev in re.findall(r'data-boss="([^"]+)" data-rev="(\d+)"', html)}
+
+
+def test_fragment_returns_only_cards_whose_rev_moved(app_module, client):
+    revs = page_revs(client)
+    assert revs.keys() == {boss['name'] for boss in app_module.get_bosses()}
+    assert client.post('/fragment', json={'revs': revs}).get_json()['cards'] == []
+    client.post('/reset/170')
+    data = client.post('/fragment', json={'revs': revs}).get_json()
+    assert not data['full']
+    assert [card['name'] for card in data['cards']] == ['170']
+    assert 'data-rev="1"' in data['cards'][0]['html']
+
+
+def test_fragment_answers_for_writes_this_process_never_saw(app_module, client):
+    revs = page_revs(client)
+    # revs live on the documents, so no per-process version history is needed
+    app_module.get_store().reset(app_module.get_boss_by_name('210'), 'elsewhere')
+    app_module.invalidate_timers()
+    app_module.tenant_state().card_versions.clear()
+    data = client.post('/fragment', json={'revs': revs}).get_json()
+    assert not data['full']
+    assert [card['name'] for card in data['cards']] == ['210']
+
+
+def test_fragment_resends_everything_for_an_old_roster(app_module, client, catalog):
+    revs = page_revs(client)
+    catalog([{'name': '170', 'respawn_minutes': 80, 'window_minutes': 5}])
+    data = client.post('/fragment', json={'revs': revs}).get_json()
+    assert data['full'] and [card['name'] for card in data['cards']] == ['170']
+    # once the page drops the removed cards it is back to incremental updates
+    data = client.post('/fragment', json={'revs': {'170': 0}}).get_json()
+    assert not data['full'] and data['cards'] == []
+    assert client.get('/fragment').get_json()['full']
@@ -0,0 +1,23 @@
+import pytest
+
+
+def test_kills_history_pages_through_the_api(client):
+    for _ in range(3):
+        client.post('/reset/170')
+    first = client.get('/api/kills?boss=170&limit=2').get_json()
+    rest = client.get('/api/kills?boss=170&limit=2&before=' + first['next_before']).get_json()
+    assert len(first['kills']) == 2 and len(rest['kills']) == 1
+    assert rest['next_before'] is None
+
+
+@pytest.mark.parametrize('before', ['2030-01-01T00:00:00+02:00', '2030-01-01T00:00:00Z', '2030-01-01T00:00:00'])
+def test_kills_before_accepts_any_iso_instant(client, before):
+    client.post('/reset/170')
+    response = client.get('/api/kills', query_string={'boss': '170', 'before': before})
+    assert response.status_code == 200
+    assert len(response.get_json()['kills']) == 1
+
+
+@pytest.mark.parametrize('query', ['before=yesterday', 'before=2030-01-01T00:00:00~nope', 'days=1e10', 'days=nan'])
+def test_kills_rejects_bad_parameters(client, query):
+    assert client.get('/api/kills?boss=170&' + query).status_code == 400
@@ -0,0 +1,40 @@
+def kills_of(client, boss):
+    return [k['user'] for k in client.get(f'/api/kills?boss={boss}').get_json()['kills']]
+
+
+def test_a_retried_reset_with_the_same_key_is_applied_once(app_module, client):
+    first = client.post('/reset/170', data={'idempotency_key': 'k1'}, follow_redirects=True)
+    retry = client.post('/reset/170', data={'idempotency_key': 'k1'}, follow_redirects=True)
+    assert b'timer reset!' in first.data
+    assert b'was already reset by tester' in retry.data
+    assert app_module.get_store().load_all()['170']['rev'] == 1
+    assert kills_of(client, '170') == ['tester']
+
+
+def test_the_key_also_works_as_a_header(app_module, client):
+    client.post('/reset/170', headers={'Idempotency-Key': 'k2'})
+    client.post('/reset/170', headers={'Idempotency-Key': 'k2'})
+    assert app_module.get_store().load_all()['170']['rev'] == 1
+
+
+def test_resets_inside_the_window_count_as_the_same_kill(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module, 'RESET_DEDUPE_SECONDS', 15)
+    client.post('/reset/170')
+    second = client.post('/reset/170', follow_redirects=True)
+    assert b'was already reset' in second.data
+    assert kills_of(client, '170') == ['tester']
+    monkeypatch.setattr(app_module, 'RESET_DEDUPE_SECONDS', 0)
+    client.post('/reset/170')
+    assert kills_of(client, '170') == ['tester', 'tester']
+
+
+def test_the_store_catches_a_duplicate_the_snapshot_has_not_seen(app_module, client, tmp_path):
+    store = app_module.SQLiteTimerStore(str(tmp_path / 'timers.db'))
+    app_module.set_store(store)
+    boss = app_module.get_boss_by_name('170')
+    app_module.load_timers()
+    # the first submission landed through another instance
+    store.reset(boss, 'elsewhere', reset_id='k3')
+    doc, created = app_module.reset_timer(boss, 'tester', 'k3')
+    assert not created and doc['user'] == 'elsewhere'
+    assert store.load_all()['170']['rev'] == 1
@@ -0,0 +1,44 @@
+import threading
+
+
+def test_upcoming_lists_spawns_in_order(app_module, client):
+    for name in ('215', '170'):
+        client.post(f'/reset/{name}')
+    upcoming = client.get('/api/upcoming').get_json()['upcoming']
+    assert [entry['name'] for entry in upcoming] == ['170', '215']
+    assert [entry['name'] for entry in client.get('/api/upcoming?limit=1').get_json()['upcoming']] == ['170']
+
+
+def test_the_catalog_is_never_reloaded_under_the_tenant_lock(app_module, client, monkeypatch):
+    ts = app_module.tenant_state()
+    reload_catalog = app_module.reload_catalog
+    held = []
+
+    def probe():
+        # another thread can only take the lock if the reloading one doesn't hold it
+        free = ts.lock.acquire(timeout=0)
+        if free:
+            ts.lock.release()
+        held.append(not free)
+
+    def checked_reload(force=True):
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+        return reload_catalog(force)
+
+    # every lookup goes back to the catalog source, as one past its check interval would
+    monkeypatch.setattr(app_module, 'reload_catalog', checked_reload)
+    monkeypatch.setattr(app_module, 'BOSS_CATALOG_CHECK_SECONDS', 0)
+    client.post('/reset/170')
+    client.get('/api/upcoming')
+    app_module.invalidate_timers()
+    client.get('/api/upcoming')
+    assert held and not any(held)
+
+
+def test_upcoming_rejects_a_window_it_cannot_use(app_module, client):
+    for within in ('1e12', 'nan', 'inf', '-5'):
+        response = client.get(f'/api/upcoming?within={within}')
+        assert response.status_code == 400 and 'within' in response.get_json()['error']
+    assert client.get('/api/upcoming?within=60').status_code == 200
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def boss():
+    return {'name': 'Test', 'respawn_minutes': 80, 'window_minutes': 5}
+
+
+def build(app_module, boss, minutes):
+    st = app_module._new_spawn_stats()
+    for value in minutes:
+        app_module._stats_add(st, boss, value)
+    return st
+
+
+def assert_same(actual, expected):
+    assert actual['count'] == expected['count']
+    assert actual['mean'] == pytest.approx(expected['mean'])
+    assert actual['m2'] == pytest.approx(expected['m2'], abs=1e-9)
+    assert actual['bins'] == expected['bins']
+
+
+@pytest.mark.parametrize('removed', [0, 2, 4])
+def test_remove_is_the_inverse_of_add(app_module, boss, removed):
+    minutes = [80.5, 82.0, 81.25, 84.75, 83.0]
+    st = build(app_module, boss, minutes)
+    app_module._stats_remove(st, boss, minutes[removed])
+    assert_same(st, build(app_module, boss, minutes[:removed] + minutes[removed + 1:]))
+
+
+def test_removing_the_only_sample_empties_the_stats(app_module, boss):
+    st = build(app_module, boss, [81.0])
+    app_module._stats_remove(st, boss, 81.0)
+    assert_same(st, build(app_module, boss, []) | {'bins': [0] * 5})
+
+
+def test_an_edit_replaces_the_latest_interval(app_module, boss):
+    start = datetime(2026, 1, 1)
+    st = app_module._new_spawn_stats()
+    app_module._stats_kill(st, boss, start)
+    app_module._stats_kill(st, boss, start + timedelta(minutes=84))
+    # the officer reset late and shifted the timer back by three minutes
+    app_module._stats_kill(st, boss, start + timedelta(minutes=81))
+    assert_same(st, build(app_module, boss, [81.0]))
+    assert st['last_interval'] == 81.0
+
+
+def test_kills_outside_the_window_are_outliers(app_module, boss):
+    start = datetime(2026, 1, 1)
+    st = app_module._new_spawn_stats()
+    app_module._stats_kill(st, boss, start)
+    app_module._stats_kill(st, boss, start + timedelta(minutes=200))
+    assert st['count'] == 0
+    assert st['outliers'] == 1
+
+
+def test_a_catalog_change_starts_the_boss_over(app_module, client, catalog):
+    ts = app_module.tenant_state()
+    ts.spawn_stats.update(seeded=True, bosses={})
+    catalog([{'name': '170', 'respawn_minutes': 80, 'window_minutes': 5}])
+    start = datetime(2026, 1, 1)
+    for i in range(6):
+        app_module.observe_kill('170', {'kill_time': start + timedelta(minutes=82 * i)})
+    assert app_module.spawn_stats('170')['count'] == 5
+    catalog([{'name': '170', 'respawn_minutes': 80, 'window_minutes': 30}])
+    app_module.observe_kill('170', {'kill_time': start + timedelta(minutes=82 * 6)})
+    assert client.get('/api/spawn-stats').status_code == 200
+    assert client.get('/').status_code == 200
+    assert app_module.spawn_stats('170')['count'] == 0
+
+
+def test_a_reload_feeds_kills_from_other_processes_into_the_stats(app_module, client):
+    ts = app_module.tenant_state()
+    ts.spawn_stats.update(seeded=True, bosses={})
+    boss = app_module.get_boss_by_name('170')
+    start = datetime(2026, 1, 1)
+    app_module.load_timers()
+    for i in range(2):
+        doc = app_module._reset_doc(boss, 'elsewhere', start + timedelta(minutes=82 * i))
+        version = ts.timer_cache['version']
+        app_module._store_snapshot(dict(ts.timer_cache['timers'], **{'170': dict(doc, rev=i + 1)}), version)
+    assert app_module.spawn_stats('170')['count'] == 1
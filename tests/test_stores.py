@@ -0,0 +1,135 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def boss(app_module):
+    return app_module.get_boss_by_name('170')
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, app_module, tmp_path):
+    if request.param == 'memory':
+        return app_module.MemoryTimerStore()
+    return app_module.SQLiteTimerStore(str(tmp_path / 'timers.db'))
+
+
+def test_reset_and_shift_bump_rev(store, boss):
+    doc, created = store.reset(boss, 'alice', reset_id='a')
+    assert created and doc['user'] == 'alice' and doc['rev'] == 1
+    assert doc['spawn_time'] - doc['kill_time'] == timedelta(minutes=80)
+    shifted = store.shift('170', 10)
+    assert shifted['kill_time'] == doc['kill_time'] - timedelta(minutes=10)
+    assert shifted['window_end_time'] == doc['window_end_time'] - timedelta(minutes=10)
+    assert shifted['rev'] == 2
+    assert store.shift('210', 10) is None
+
+
+def test_reset_dedupes_on_reset_id_and_window(store, boss):
+    first, _ = store.reset(boss, 'alice', reset_id='a', dedupe_seconds=15)
+    doc, created = store.reset(boss, 'bob', reset_id='a')
+    assert not created and doc['user'] == 'alice'
+    doc, created = store.reset(boss, 'bob', reset_id='b', dedupe_seconds=15)
+    assert not created and doc['reset_id'] == first['reset_id']
+    doc, created = store.reset(boss, 'bob', reset_id='c')
+    assert created and doc['user'] == 'bob' and doc['rev'] == 2
+
+
+def test_query_kills_pages_through_equal_kill_times(store):
+    # five kills share one kill_time; a (kill_time, id) cursor must visit each once
+    when = datetime(2026, 1, 1, 12, 0)
+    store.append_kills([
+        {'name': '170', 'kill_time': when, 'user': f'u{i}', 'action': 'import', 'recorded_at': when}
+        for i in range(5)
+    ] + [{'name': '170', 'kill_time': when - timedelta(hours=1), 'user': 'early', 'action': 'reset', 'recorded_at': when}])
+    seen, before, before_id = [], None, None
+    while True:
+        page = store.query_kills(before=before, before_id=before_id, limit=2)
+        if not page:
+            break
+        seen += [kill['user'] for kill in page]
+        before, before_id = page[-1]['kill_time'], page[-1]['id']
+    assert sorted(seen[:5]) == [f'u{i}' for i in range(5)]
+    assert seen[5:] == ['early']
+
+
+def test_sqlite_tenants_share_a_file(app_module, tmp_path, boss):
+    path = str(tmp_path / 'timers.db')
+    axiom = app_module.SQLiteTimerStore(path, 'axiom')
+    nova = app_module.SQLiteTimerStore(path, 'nova')
+    axiom.reset(boss, 'alice')
+    nova.reset(boss, 'bob')
+    assert axiom.load_all()['170']['user'] == 'alice'
+    assert nova.load_all()['170']['user'] == 'bob'
+
+
+def test_sqlite_adds_the_tenant_key_to_a_legacy_file(app_module, tmp_path, boss):
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE timers (name TEXT PRIMARY KEY, kill_time INTEGER, spawn_time INTEGER, '
+        'window_end_time INTEGER, user TEXT)'
+    )
+    conn.execute("INSERT INTO timers VALUES ('170', 0, 4800000, 5100000, 'old')")
+    conn.execute('CREATE TABLE kills (name TEXT NOT NULL, kill_time INTEGER NOT NULL, user TEXT, action TEXT, recorded_at INTEGER)')
+    conn.execute("INSERT INTO kills VALUES ('170', 0, 'old', 'reset', 0)")
+    conn.commit()
+    conn.close()
+
+    store = app_module.SQLiteTimerStore(path, app_module.DEFAULT_TENANT)
+    doc = store.load_all()['170']
+    assert doc['user'] == 'old' and doc['kill_time'] == datetime(1970, 1, 1) and doc['rev'] == 0
+    assert [kill['user'] for kill in store.query_kills()] == ['old']
+    # the same boss name is now free for another tenant
+    other = app_module.SQLiteTimerStore(path, 'nova')
+    assert other.load_all() == {}
+    assert other.query_kills() == []
+    other.reset(boss, 'bob')
+    assert store.load_all()['170']['user'] == 'old'
+    columns = [row[1] for row in sqlite3.connect(path).execute('PRAGMA table_info(timers)')]
+    assert columns[:2] == ['tenant', 'name']
+
+
+def test_sqlite_failed_kill_append_leaves_the_connection_usable(app_module, tmp_path, boss):
+    store = app_module.SQLiteTimerStore(str(tmp_path / 'timers.db'))
+    when = datetime(2026, 1, 1, 12, 0)
+    with pytest.raises(sqlite3.IntegrityError):
+        store.append_kills([{'name': None, 'kill_time': when, 'user': 'u', 'action': 'reset', 'recorded_at': when}])
+    store.append_kills([{'name': '170', 'kill_time': when, 'user': 'u', 'action': 'reset', 'recorded_at': when}])
+    assert store.reset(boss, 'alice')[0]['user'] == 'alice'
+    assert [kill['user'] for kill in store.query_kills()] == ['u']
+
+
+def test_flush_retries_only_the_kills_that_failed(app_module, boss):
+    class FlakyStore(app_module.MemoryTimerStore):
+        # stores every record but reports the second one of the first batch as failed,
+        # the way a partly applied batch or a lost acknowledgement looks to the caller
+        failed = False
+
+        def append_kills(self, kills):
+            super().append_kills(kills)
+            if self.failed:
+                return {}
+            self.failed = True
+            return {1: 'lost'}
+
+    app_module.flush_kills()
+    store = FlakyStore()
+    app_module.set_store(store)
+    for user in ('u0', 'u1', 'u2'):
+        app_module.record_kill(app_module._reset_doc(boss, user, app_module.utcnow()), 'reset')
+    assert app_module.flush_kills() == 2
+    assert app_module.flush_kills() == 1
+    assert sorted(kill['user'] for kill in store.query_kills()) == ['u0', 'u1', 'u2']
+
+
+def test_save_many_never_moves_a_timer_back(app_module, store, boss):
+    newer, _ = store.reset(boss, 'alice')
+    older = app_module._reset_doc(boss, 'bob', newer['kill_time'] - timedelta(hours=1), 'r1')
+    fresh = app_module._reset_doc(app_module.get_boss_by_name('210'), 'bob', newer['kill_time'], 'r2')
+    assert store.save_many([older, fresh]) == {0: app_module.STALE_WRITE}
+    timers = store.load_all()
+    assert timers['170']['user'] == 'alice' and timers['170']['rev'] == newer['rev']
+    assert timers['210']['user'] == 'bob'
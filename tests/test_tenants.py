@@ -0,0 +1,82 @@
+import pytest
+
+NOVA_CATALOG = [
+    {'name': '170', 'respawn_minutes': 10, 'window_minutes': 1},
+    {'name': 'Kraken', 'respawn_minutes': 60, 'window_minutes': 5},
+]
+
+
+@pytest.fixture
+def tenants(app_module, client, monkeypatch):
+    # a second clan next to the default one, each with its own users and token
+    default = app_module.DEFAULT_TENANT
+    monkeypatch.setitem(app_module._tenant_configs, default, {'users': {'alice': 'pw'}, 'api_tokens': ['axiom-token']})
+    monkeypatch.setitem(app_module._tenant_configs, 'nova', {'users': {'bob': 'pw'}, 'api_tokens': ['nova-token'], 'catalog': NOVA_CATALOG})
+    yield default, 'nova'
+    app_module._stores.pop('nova', None)
+    app_module._tenant_states.pop('nova', None)
+
+
+def login(app_module, username, tenant):
+    client = app_module.app.test_client()
+    response = client.post('/login', data={'username': username, 'password': 'pw', 'tenant': tenant})
+    assert response.status_code == 302
+    return client
+
+
+def names_and_users(response):
+    return {boss['name']: boss['user'] for boss in response.get_json()['bosses']}
+
+
+def test_each_tenant_sees_only_its_catalog_and_timers(app_module, tenants):
+    default, nova = tenants
+    alice, bob = login(app_module, 'alice', default), login(app_module, 'bob', nova)
+    alice.post('/reset/170')
+    bob.post('/reset/Kraken')
+    axiom_timers = names_and_users(alice.get('/api/timers'))
+    nova_timers = names_and_users(bob.get('/api/timers'))
+    assert axiom_timers['170'] == 'alice' and 'Kraken' not in axiom_timers
+    assert nova_timers == {'170': None, 'Kraken': 'bob'}
+
+
+def test_users_cannot_log_in_to_another_tenant(app_module, tenants):
+    default, nova = tenants
+    client = app_module.app.test_client()
+    response = client.post('/login', data={'username': 'bob', 'password': 'pw', 'tenant': default})
+    assert response.status_code == 200
+    with client.session_transaction() as sess:
+        assert 'username' not in sess
+
+
+def test_kill_history_is_per_tenant(app_module, tenants):
+    default, nova = tenants
+    alice, bob = login(app_module, 'alice', default), login(app_module, 'bob', nova)
+    alice.post('/reset/170')
+    bob.post('/reset/170')
+    assert [k['user'] for k in alice.get('/api/kills?boss=170').get_json()['kills']] == ['alice']
+    assert [k['user'] for k in bob.get('/api/kills?boss=170').get_json()['kills']] == ['bob']
+
+
+def test_tokens_resolve_to_their_own_tenant(app_module, tenants):
+    default, nova = tenants
+    login(app_module, 'bob', nova).post('/reset/Kraken')
+    api = app_module.app.test_client()
+    nova_view = api.get('/api/timers', headers={'Authorization': 'Bearer nova-token'})
+    axiom_view = api.get('/api/timers', headers={'Authorization': 'Bearer axiom-token'})
+    assert names_and_users(nova_view)['Kraken'] == 'bob'
+    assert 'Kraken' not in names_and_users(axiom_view)
+    assert api.get('/api/timers', headers={'Authorization': 'Bearer nope'}).status_code == 401
+
+
+def test_admins_only_see_their_own_tenants_profiles(app_module, tenants, monkeypatch, tmp_path):
+    default, nova = tenants
+    monkeypatch.setattr(app_module, 'PROFILE_DIR', str(tmp_path))
+    monkeypatch.setitem(app_module._tenant_configs[default], 'admins', ['alice'])
+    monkeypatch.setitem(app_module._tenant_configs[nova], 'admins', ['bob'])
+    alice, bob = login(app_module, 'alice', default), login(app_module, 'bob', nova)
+    axiom_dump = alice.get('/api/timers?_profile=1').headers['X-Profile-Id']
+    nova_dump = bob.get('/api/timers?_profile=1').headers['X-Profile-Id']
+    assert alice.get('/profiles').get_json()['profiles'] == [axiom_dump]
+    assert bob.get('/profiles').get_json()['profiles'] == [nova_dump]
+    assert bob.get(f'/profiles/{nova_dump}').status_code == 200
+    assert bob.get(f'/profiles/{axiom_dump}').status_code == 404
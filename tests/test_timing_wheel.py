@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.mark.parametrize('start', [0, 1003])
+def test_items_come_due_at_their_second_across_levels_and_overflow(app_module, start):
+    # 4 slots x 2 levels cover 16 seconds, so the later items cascade or overflow
+    wheel = app_module.TimingWheel(start, slots=4, levels=2)
+    offsets = [1, 3, 4, 5, 15, 16, 17, 40, 63]
+    for offset in offsets:
+        wheel.add(start + offset, offset)
+    fired = {}
+    for now in range(start + 1, start + 70):
+        for item in wheel.advance(now):
+            fired[item] = now - start
+    assert fired == {offset: offset for offset in offsets}
+    assert wheel.size == 0
+
+
+def test_advance_returns_everything_due_in_a_jump(app_module):
+    wheel = app_module.TimingWheel(100, slots=4, levels=2)
+    for offset in (2, 9, 30):
+        wheel.add(100 + offset, offset)
+    assert sorted(wheel.advance(120)) == [2, 9]
+    assert wheel.advance(140) == [30]
+
+
+def test_past_items_fire_on_the_next_tick(app_module):
+    wheel = app_module.TimingWheel(50, slots=4, levels=2)
+    wheel.add(10, 'late')
+    assert wheel.advance(50) == []
+    assert wheel.advance(51) == ['late']